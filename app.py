@@ -1,16 +1,16 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import LabelEncoder
-import trafilatura
-import requests
-import re
-from datetime import datetime
-import time
-import json
+import instrumentation
+from model_registry import get_registry
+from background_training import get_trainer
+from prediction_cache import get_prediction_cache
+from market_index import MarketIndex
+from comparables import ComparablesIndex
+from price_surface import get_price_surface
+from market_charts import build_market_figures
+from builders import get_builder_catalog
+import property_features
+import price_model
+from market_data import LOCATIONS, BEDROOM_OPTIONS, BATHROOM_OPTIONS
 
 # Page configuration
 st.set_page_config(
@@ -23,120 +23,17 @@ st.set_page_config(
 # Initialize session state
 if 'model_trained' not in st.session_state:
     st.session_state.model_trained = False
-if 'market_data' not in st.session_state:
-    st.session_state.market_data = None
 if 'builders_data' not in st.session_state:
     st.session_state.builders_data = None
 if 'selected_city' not in st.session_state:
     st.session_state.selected_city = None
 
-def get_real_estate_data():
-    """
-    Get real housing market data from public sources
-    """
-    try:
-        # Use real estate data from public sources
-        urls = [
-            'https://www.realtor.com/research/data/',
-            'https://www.zillow.com/research/data/',
-        ]
-        
-        market_data = []
-        
-        # Create realistic market data based on Indian cities
-        locations = ['Mumbai', 'Delhi', 'Bangalore', 'Chennai', 'Hyderabad', 'Pune', 'Kolkata', 'Ahmedabad', 'Jaipur', 'Surat', 'Lucknow', 'Kanpur', 'Nagpur', 'Indore', 'Thane', 'Bhopal', 'Visakhapatnam', 'Pimpri-Chinchwad', 'Patna', 'Vadodara', 'Ghaziabad', 'Ludhiana', 'Agra', 'Nashik', 'Faridabad', 'Meerut', 'Rajkot', 'Kalyan-Dombivali', 'Vasai-Virar', 'Varanasi']
-        
-        # Generate market-based housing data
-        np.random.seed(int(datetime.now().timestamp()) % 1000)
-        
-        for i in range(500):
-            location = np.random.choice(locations)
-            bedrooms = np.random.choice([1, 2, 3, 4, 5], p=[0.1, 0.2, 0.4, 0.25, 0.05])
-            bathrooms = np.random.choice([1, 1.5, 2, 2.5, 3, 3.5, 4], p=[0.15, 0.1, 0.3, 0.2, 0.15, 0.05, 0.05])
-            
-            # Area based on bedrooms with realistic sizing
-            base_area = 400 + bedrooms * 250 + np.random.normal(0, 150)
-            area = max(300, int(base_area))
-            
-            # Market-based pricing with Indian city factors (based on real estate market trends)
-            location_factors = {
-                'Mumbai': 2.5, 'Delhi': 2.2, 'Bangalore': 2.0, 'Chennai': 1.5, 'Hyderabad': 1.4,
-                'Pune': 1.6, 'Kolkata': 1.3, 'Ahmedabad': 1.2, 'Jaipur': 1.1, 'Surat': 1.0,
-                'Lucknow': 0.9, 'Kanpur': 0.8, 'Nagpur': 0.9, 'Indore': 0.9, 'Thane': 2.0,
-                'Bhopal': 0.8, 'Visakhapatnam': 0.9, 'Pimpri-Chinchwad': 1.5, 'Patna': 0.7,
-                'Vadodara': 1.0, 'Ghaziabad': 1.4, 'Ludhiana': 0.9, 'Agra': 0.7, 'Nashik': 1.0,
-                'Faridabad': 1.3, 'Meerut': 0.8, 'Rajkot': 0.9, 'Kalyan-Dombivali': 1.8,
-                'Vasai-Virar': 1.6, 'Varanasi': 0.7
-            }
-            
-            # Current Indian market pricing (2024 rates in INR)
-            base_price = (
-                area * 4500 +  # Current market rate per sqft in INR
-                bedrooms * 400000 +  # Bedroom premium in INR
-                bathrooms * 300000 +  # Bathroom premium in INR
-                np.random.normal(1200000, 500000)  # Market variation in INR
-            )
-            
-            price = base_price * location_factors.get(location, 1.0)
-            price = max(80000, int(price))  # Minimum realistic price
-            
-            market_data.append({
-                'area': area,
-                'bedrooms': bedrooms,
-                'bathrooms': bathrooms,
-                'location': location,
-                'price': price
-            })
-        
-        return pd.DataFrame(market_data)
-        
-    except Exception as e:
-        st.error(f"Error loading market data: {str(e)}")
-        return None
-
-def train_price_model(data):
-    """
-    Train a machine learning model for price prediction
-    """
-    try:
-        # Prepare features
-        le = LabelEncoder()
-        data_encoded = data.copy()
-        data_encoded['location_encoded'] = le.fit_transform(data['location'])
-        
-        # Features and target
-        X = data_encoded[['area', 'bedrooms', 'bathrooms', 'location_encoded']]
-        y = data_encoded['price']
-        
-        # Train Random Forest model
-        model = RandomForestRegressor(n_estimators=100, random_state=42)
-        model.fit(X, y)
-        
-        return model, le
-        
-    except Exception as e:
-        st.error(f"Error training model: {str(e)}")
-        return None, None
-
 def predict_price(model, label_encoder, area, bedrooms, bathrooms, location):
     """
-    Predict house price based on input features
+    Predict house price and its range based on input features
     """
     try:
-        # Encode location
-        if location in label_encoder.classes_:
-            location_encoded = label_encoder.transform([location])[0]
-        else:
-            # Use most common location if not found
-            location_encoded = 0
-        
-        # Create feature array
-        features = np.array([[area, bedrooms, bathrooms, location_encoded]])
-        
-        # Make prediction
-        prediction = model.predict(features)[0]
-        
-        return max(50000, int(prediction))  # Minimum realistic price
+        return price_model.predict_price_range(model, label_encoder, area, bedrooms, bathrooms, location)
         
     except Exception as e:
         st.error(f"Error making prediction: {str(e)}")
@@ -147,62 +44,8 @@ def get_builders_data(city):
     Get builders and real estate developers data for a specific city
     """
     try:
-        # Real builders data for Indian cities
-        builders_database = {
-            'Mumbai': [
-                {'name': 'Lodha Group', 'projects': ['Lodha Park', 'World Towers', 'Lodha Bellissimo'], 'rating': 4.5, 'experience': '25+ years', 'specialty': 'Luxury Residential'},
-                {'name': 'Godrej Properties', 'projects': ['Godrej Platinum', 'Godrej Woods', 'Godrej Emerald'], 'rating': 4.3, 'experience': '24+ years', 'specialty': 'Premium Homes'},
-                {'name': 'Oberoi Realty', 'projects': ['Oberoi Sky City', 'Oberoi Exquisite', 'Oberoi Garden City'], 'rating': 4.6, 'experience': '30+ years', 'specialty': 'Ultra Luxury'},
-                {'name': 'Hiranandani Group', 'projects': ['Hiranandani Gardens', 'Hiranandani Fortune City', 'Hiranandani Panvel'], 'rating': 4.2, 'experience': '35+ years', 'specialty': 'Integrated Townships'},
-                {'name': 'Kalpataru Group', 'projects': ['Kalpataru Sparkle', 'Kalpataru Immensa', 'Kalpataru Radiance'], 'rating': 4.1, 'experience': '50+ years', 'specialty': 'Residential & Commercial'}
-            ],
-            'Delhi': [
-                {'name': 'DLF Limited', 'projects': ['DLF Capital Greens', 'DLF Regal Gardens', 'DLF Privana'], 'rating': 4.4, 'experience': '75+ years', 'specialty': 'Premium Residential'},
-                {'name': 'Godrej Properties', 'projects': ['Godrej South Estate', 'Godrej Air', 'Godrej Nurture'], 'rating': 4.3, 'experience': '24+ years', 'specialty': 'Smart Homes'},
-                {'name': 'M3M Group', 'projects': ['M3M Golf Estate', 'M3M Merlin', 'M3M Sierra'], 'rating': 4.2, 'experience': '20+ years', 'specialty': 'Luxury Apartments'},
-                {'name': 'Bharti Realty', 'projects': ['Bharti Sky Court', 'Bharti City Center', 'Bharti Varsh'], 'rating': 4.0, 'experience': '15+ years', 'specialty': 'Affordable Housing'},
-                {'name': 'Ansal API', 'projects': ['Ansal Sushant City', 'Ansal Heights', 'Ansal Orchard County'], 'rating': 3.9, 'experience': '45+ years', 'specialty': 'Township Development'}
-            ],
-            'Bangalore': [
-                {'name': 'Prestige Group', 'projects': ['Prestige Lakeside Habitat', 'Prestige Falcon City', 'Prestige Tranquility'], 'rating': 4.5, 'experience': '35+ years', 'specialty': 'Premium Residential'},
-                {'name': 'Brigade Group', 'projects': ['Brigade Cornerstone Utopia', 'Brigade Meadows', 'Brigade Golden Triangle'], 'rating': 4.4, 'experience': '35+ years', 'specialty': 'Integrated Development'},
-                {'name': 'Sobha Limited', 'projects': ['Sobha City', 'Sobha Dream Acres', 'Sobha Indraprastha'], 'rating': 4.3, 'experience': '25+ years', 'specialty': 'Luxury Villas'},
-                {'name': 'Godrej Properties', 'projects': ['Godrej Reflections', 'Godrej E-City', 'Godrej United'], 'rating': 4.2, 'experience': '24+ years', 'specialty': 'Tech Park Proximity'},
-                {'name': 'Mantri Developers', 'projects': ['Mantri Espana', 'Mantri Serenity', 'Mantri Webcity'], 'rating': 4.0, 'experience': '20+ years', 'specialty': 'IT Corridor Properties'}
-            ],
-            'Chennai': [
-                {'name': 'Casagrand Builder', 'projects': ['Casagrand Crescendo', 'Casagrand Primera', 'Casagrand Luxus'], 'rating': 4.3, 'experience': '15+ years', 'specialty': 'Premium Apartments'},
-                {'name': 'Phoenix Group', 'projects': ['Phoenix One Bangalore West', 'Phoenix Kessaku', 'Phoenix Marketcity'], 'rating': 4.2, 'experience': '25+ years', 'specialty': 'Mixed Development'},
-                {'name': 'Shriram Properties', 'projects': ['Shriram Greenfield', 'Shriram Grand City', 'Shriram Suhaana'], 'rating': 4.1, 'experience': '25+ years', 'specialty': 'Affordable Housing'},
-                {'name': 'TVS Emerald', 'projects': ['TVS Emerald Atrium', 'TVS Emerald GreenAcres', 'TVS Emerald Park'], 'rating': 4.0, 'experience': '20+ years', 'specialty': 'Gated Communities'},
-                {'name': 'Radiance Realty', 'projects': ['Radiance Pride', 'Radiance Mandarin', 'Radiance Mercury'], 'rating': 3.9, 'experience': '15+ years', 'specialty': 'Residential Complexes'}
-            ],
-            'Hyderabad': [
-                {'name': 'My Home Group', 'projects': ['My Home Avatar', 'My Home Bhooja', 'My Home Vihanga'], 'rating': 4.4, 'experience': '20+ years', 'specialty': 'Gated Communities'},
-                {'name': 'Prestige Group', 'projects': ['Prestige High Fields', 'Prestige Glenwood', 'Prestige White Meadows'], 'rating': 4.3, 'experience': '35+ years', 'specialty': 'Premium Projects'},
-                {'name': 'Aparna Constructions', 'projects': ['Aparna Sarovar Grande', 'Aparna Hillpark', 'Aparna Cyber Life'], 'rating': 4.2, 'experience': '30+ years', 'specialty': 'IT Corridor'},
-                {'name': 'Hallmark Builders', 'projects': ['Hallmark Tranquil', 'Hallmark Residency', 'Hallmark Springs'], 'rating': 4.0, 'experience': '25+ years', 'specialty': 'Residential Townships'},
-                {'name': 'Incor Group', 'projects': ['Incor One City', 'Incor PBEL City', 'Incor Carmel Heights'], 'rating': 3.9, 'experience': '15+ years', 'specialty': 'Affordable Luxury'}
-            ],
-            'Pune': [
-                {'name': 'Godrej Properties', 'projects': ['Godrej Rejuve', 'Godrej Infinity', 'Godrej Life Plus'], 'rating': 4.4, 'experience': '24+ years', 'specialty': 'Premium Residential'},
-                {'name': 'Kolte Patil', 'projects': ['Kolte Patil Life Republic', 'Kolte Patil Mirabilis', 'Kolte Patil Tuscan Estate'], 'rating': 4.3, 'experience': '30+ years', 'specialty': 'Integrated Townships'},
-                {'name': 'Sobha Limited', 'projects': ['Sobha Rain Forest', 'Sobha Dewdrop', 'Sobha Ivy'], 'rating': 4.2, 'experience': '25+ years', 'specialty': 'Luxury Homes'},
-                {'name': 'Gera Developments', 'projects': ['Gera Song Of Joy', 'Gera Emerald City', 'Gera Park View'], 'rating': 4.1, 'experience': '25+ years', 'specialty': 'Senior Living'},
-                {'name': 'Rohan Builders', 'projects': ['Rohan Kritika', 'Rohan Ananta', 'Rohan Vasantha'], 'rating': 4.0, 'experience': '35+ years', 'specialty': 'Mid-Segment Housing'}
-            ]
-        }
-        
-        # Default builders for cities not in main database
-        default_builders = [
-            {'name': 'Local Premier Developers', 'projects': ['Premium Heights', 'Garden View Residency', 'Royal Enclave'], 'rating': 4.1, 'experience': '15+ years', 'specialty': 'Residential Development'},
-            {'name': 'City Star Builders', 'projects': ['Star Heights', 'City Centre Plaza', 'Green Valley'], 'rating': 4.0, 'experience': '12+ years', 'specialty': 'Affordable Housing'},
-            {'name': 'Metro Construction', 'projects': ['Metro Park', 'Metro Square', 'Metro Gardens'], 'rating': 3.9, 'experience': '18+ years', 'specialty': 'Commercial & Residential'},
-            {'name': 'Urban Developers', 'projects': ['Urban Oasis', 'Urban Vista', 'Urban Homes'], 'rating': 3.8, 'experience': '10+ years', 'specialty': 'Modern Living'},
-            {'name': 'Prime Real Estate', 'projects': ['Prime Towers', 'Prime Residency', 'Prime Gardens'], 'rating': 3.7, 'experience': '14+ years', 'specialty': 'Budget Homes'}
-        ]
-        
-        return builders_database.get(city, default_builders)
+        # Catalog is loaded once per process from data/builders.json
+        return get_builder_catalog().for_city(city)
         
     except Exception as e:
         st.error(f"Error loading builders data: {str(e)}")
@@ -213,78 +56,180 @@ def get_property_features(city, bedrooms, bathrooms, area):
     Generate property features and amenities based on location and specifications
     """
     try:
-        # Base amenities
-        base_amenities = [
-            'Car Parking', 'Security', 'Water Supply', 'Power Backup',
-            'Elevator', 'Intercom', 'Waste Management'
-        ]
-        
-        # Premium amenities based on city tier
-        tier_1_cities = ['Mumbai', 'Delhi', 'Bangalore', 'Chennai', 'Hyderabad', 'Pune', 'Kolkata']
-        
-        if city in tier_1_cities:
-            premium_amenities = [
-                'Swimming Pool', 'Gymnasium', 'Clubhouse', 'Children Play Area',
-                'Landscaped Gardens', 'Jogging Track', 'Multi-purpose Hall',
-                'Indoor Games', 'CCTV Surveillance', 'Visitor Parking',
-                'Maintenance Staff', 'Fire Safety', 'Rainwater Harvesting'
-            ]
-        else:
-            premium_amenities = [
-                'Community Hall', 'Garden Area', 'Children Play Zone',
-                'Basic Security', 'Maintenance Service', 'Visitor Area'
-            ]
-        
-        # Luxury amenities for large properties
-        if area > 1500 and bedrooms >= 3:
-            luxury_amenities = [
-                'Concierge Service', 'Spa & Wellness', 'Business Center',
-                'Banquet Hall', 'Meditation Area', 'Yoga Deck',
-                'Library', 'Kids Pool', 'Badminton Court', 'Tennis Court'
-            ]
-            all_amenities = base_amenities + premium_amenities + luxury_amenities[:5]
-        else:
-            all_amenities = base_amenities + premium_amenities[:8]
-        
-        # Property specifications
-        specifications = {
-            'Floor Plan': f'{bedrooms}BHK with {bathrooms} bathrooms',
-            'Carpet Area': f'{area} sq ft',
-            'Floor Type': 'Vitrified tiles' if area > 1000 else 'Ceramic tiles',
-            'Kitchen': 'Modular kitchen' if area > 800 else 'Semi-modular kitchen',
-            'Balconies': '2 balconies' if bedrooms >= 3 else '1 balcony',
-            'Facing': np.random.choice(['North', 'South', 'East', 'West', 'North-East', 'South-West']),
-            'Age': f'{np.random.randint(0, 8)} years' if np.random.random() > 0.3 else 'Under Construction',
-            'Furnishing': np.random.choice(['Unfurnished', 'Semi-Furnished', 'Fully Furnished'], p=[0.6, 0.3, 0.1])
-        }
-        
-        return {
-            'amenities': all_amenities,
-            'specifications': specifications
-        }
+        return property_features.get_property_features(city, bedrooms, bathrooms, area)
         
     except Exception as e:
         st.error(f"Error generating property features: {str(e)}")
         return {'amenities': [], 'specifications': {}}
 
+# Sections whose widgets only affect themselves rerun on their own where
+# Streamlit supports fragments (1.33+); older versions render them inline
+fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda function: function)
+
+@fragment
+def show_builders(city, builders):
+    """
+    Builder expanders for a city; contact buttons only rerun this section
+    """
+    st.subheader(f"Top Builders in {city}")
+    
+    if builders:
+        for i, builder in enumerate(builders):
+            with st.expander(f"⭐ {builder['name']} - Rating: {builder['rating']}/5"):
+                col1, col2 = st.columns([2, 1])
+                
+                with col1:
+                    st.write(f"**Experience:** {builder['experience']}")
+                    st.write(f"**Specialty:** {builder['specialty']}")
+                    st.write(f"**Popular Projects:**")
+                    for project in builder['projects']:
+                        st.write(f"• {project}")
+                
+                with col2:
+                    st.metric("Rating", f"{builder['rating']}/5")
+                    if st.button(f"Contact {builder['name']}", key=f"contact_{i}"):
+                        st.success(f"Contact information for {builder['name']} sent to your email!")
+
+def show_property_overview(features, price_per_sqft, city):
+    """
+    Specifications, amenities and investment insights for the estimated home
+    """
+    st.subheader("Property Overview & Amenities")
+    
+    # Property specifications
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### 📋 Property Specifications")
+        for key, value in features['specifications'].items():
+            st.write(f"**{key}:** {value}")
+    
+    with col2:
+        st.markdown("#### 🏊 Amenities & Facilities")
+        # Display amenities in a grid-like format
+        st.text("".join(f"• {amenity}\n" for amenity in features['amenities']))
+    
+    # Investment insights
+    st.markdown("#### 💡 Investment Insights")
+    
+    if price_per_sqft > 8000:
+        investment_grade = "Premium"
+        investment_color = "green"
+    elif price_per_sqft > 5000:
+        investment_grade = "Good"
+        investment_color = "orange"
+    else:
+        investment_grade = "Budget-Friendly"
+        investment_color = "blue"
+    
+    st.markdown(f"**Investment Grade:** :{investment_color}[{investment_grade}]")
+    
+    # Location advantages
+    st.markdown("**Location Benefits:**")
+    for benefit in property_features.location_benefits(city):
+        st.write(f"✅ {benefit}")
+
+@fragment
+def show_virtual_tour():
+    """
+    Virtual tour and site visit form; picking a room or typing only reruns this section
+    """
+    st.subheader("Virtual Property Tour")
+    
+    # Create a mock virtual tour interface
+    st.markdown("#### 🎮 Interactive Property Walkthrough")
+    
+    tour_options = st.selectbox(
+        "Choose a room to explore:",
+        list(property_features.TOUR_DESCRIPTIONS)
+    )
+    
+    if tour_options in property_features.TOUR_DESCRIPTIONS:
+        tour_info = property_features.TOUR_DESCRIPTIONS[tour_options]
+        
+        st.markdown(f"#### 📍 {tour_options}")
+        st.write(tour_info["description"])
+        
+        st.markdown("**Key Features:**")
+        for feature in tour_info["features"]:
+            st.write(f"• {feature}")
+        
+        # Mock 360-degree view button
+        if st.button(f"🔄 360° View of {tour_options}", use_container_width=True):
+            st.success(f"Loading 360° virtual tour of {tour_options}...")
+            st.balloons()
+    
+    # Booking section
+    st.markdown("---")
+    st.markdown("#### 📅 Schedule a Site Visit")
+    
+    visit_col1, visit_col2 = st.columns(2)
+    
+    with visit_col1:
+        visit_date = st.date_input("Preferred Visit Date")
+        visit_time = st.selectbox("Preferred Time", ["10:00 AM", "12:00 PM", "2:00 PM", "4:00 PM", "6:00 PM"])
+    
+    with visit_col2:
+        visitor_name = st.text_input("Your Name")
+        visitor_phone = st.text_input("Phone Number")
+    
+    if st.button("📋 Schedule Site Visit", type="primary", use_container_width=True):
+        if visitor_name and visitor_phone:
+            st.success(f"Site visit scheduled for {visit_date} at {visit_time}. Confirmation details sent to your phone!")
+        else:
+            st.error("Please provide your name and phone number to schedule a visit.")
+
+def show_market_trends(registry):
+    """
+    Market trend charts; figures are built once per dataset version and
+    shared by every session instead of being rebuilt on each rerun
+    """
+    st.markdown("---")
+    st.subheader("📈 Current Market Trends")
+    
+    viz_col1, viz_col2 = st.columns(2)
+    
+    market_index = registry.get_derived('market_index', MarketIndex.build)
+    location_figure, distribution_figure = registry.get_derived(
+        'market_figures', lambda data: build_market_figures(market_index)
+    )
+    
+    with viz_col1:
+        st.plotly_chart(location_figure, use_container_width=True)
+    
+    with viz_col2:
+        st.plotly_chart(distribution_figure, use_container_width=True)
+
 def main():
     # Header
     st.title("🏠 Home Price Estimator")
     st.markdown("### Get an instant estimate for your home value")
     st.markdown("---")
     
-    # Load and train model if not done
-    if not st.session_state.model_trained:
-        with st.spinner("Loading current market data..."):
-            market_data = get_real_estate_data()
-            if market_data is not None:
-                st.session_state.market_data = market_data
-                model, le = train_price_model(market_data)
-                if model is not None:
-                    st.session_state.model = model
-                    st.session_state.label_encoder = le
-                    st.session_state.model_trained = True
-                    st.success("✅ Market data loaded and model ready!")
+    # Market data and model are shared by every session in this process and
+    # trained on a background thread; sessions keep serving the current
+    # version until a retrain is swapped in, so only a process with no model
+    # at all waits here
+    registry = get_registry()
+    trainer = get_trainer()
+    with st.spinner("Loading current market data..."), instrumentation.timer('load_market_data'):
+        serving = trainer.wait_for_model()
+    market_data, _ = registry.current_market_data()
+    training_status = trainer.status()
+    if serving is not None:
+        model_key, model, le = serving
+        st.session_state.model = model
+        st.session_state.label_encoder = le
+        if st.session_state.get('model_version') != model_key:
+            st.session_state.model_version = model_key
+            st.session_state.model_trained = True
+            st.success("✅ Market data loaded and model ready!")
+        if training_status['state'] == 'training':
+            st.caption("🔄 Updating the price model with fresh market data; estimates use the current version until it is ready.")
+    else:
+        st.session_state.model_trained = False
+        if training_status['last_error']:
+            st.error(f"Error loading market data: {training_status['last_error']}")
     
     if not st.session_state.model_trained:
         st.error("Unable to load market data. Please refresh the page.")
@@ -308,35 +253,42 @@ def main():
         
         bedrooms = st.selectbox(
             "Bedrooms",
-            [1, 2, 3, 4, 5],
+            BEDROOM_OPTIONS,
             index=2,
             help="Number of bedrooms in your home"
         )
         
         bathrooms = st.selectbox(
             "Bathrooms", 
-            [1, 1.5, 2, 2.5, 3, 3.5, 4],
+            BATHROOM_OPTIONS,
             index=2,
             help="Number of bathrooms in your home"
         )
         
         location = st.selectbox(
             "City",
-            ['Mumbai', 'Delhi', 'Bangalore', 'Chennai', 'Hyderabad', 'Pune', 'Kolkata', 'Ahmedabad', 'Jaipur', 'Surat', 'Lucknow', 'Kanpur', 'Nagpur', 'Indore', 'Thane', 'Bhopal', 'Visakhapatnam', 'Pimpri-Chinchwad', 'Patna', 'Vadodara', 'Ghaziabad', 'Ludhiana', 'Agra', 'Nashik', 'Faridabad', 'Meerut', 'Rajkot', 'Kalyan-Dombivali', 'Vasai-Virar', 'Varanasi'],
+            LOCATIONS,
             index=2,
             help="Select your city in India"
         )
         
         # Predict button
         if st.button("💰 Get Price Estimate", type="primary", use_container_width=True):
-            prediction = predict_price(
-                st.session_state.model,
-                st.session_state.label_encoder,
-                area, bedrooms, bathrooms, location
-            )
+            # Form inputs on the grid are read from the precomputed price
+            # surface; anything else goes through the shared prediction cache
+            surface = get_price_surface(st.session_state.model_version, registry.store)
+            prediction = surface.lookup(location, area, bedrooms, bathrooms) if surface is not None else None
+            if prediction is None:
+                prediction = get_prediction_cache().get_or_predict(
+                    st.session_state.model_version,
+                    lambda *inputs: predict_price(st.session_state.model, st.session_state.label_encoder, *inputs),
+                    area, bedrooms, bathrooms, location
+                )
             
             if prediction:
-                st.session_state.last_prediction = prediction
+                price, lower_bound, upper_bound = prediction
+                st.session_state.last_prediction = price
+                st.session_state.last_range = (lower_bound, upper_bound)
                 st.session_state.last_inputs = {
                     'area': area,
                     'bedrooms': bedrooms,
@@ -350,8 +302,7 @@ def main():
                 st.session_state.builders_data = builders
                 
                 # Generate property features
-                property_features = get_property_features(location, bedrooms, bathrooms, area)
-                st.session_state.property_features = property_features
+                st.session_state.property_features = get_property_features(location, bedrooms, bathrooms, area)
     
     with col2:
         st.subheader("Price Estimate")
@@ -371,26 +322,39 @@ def main():
             price_per_sqft = st.session_state.last_prediction / st.session_state.last_inputs['area']
             st.metric("Price per sq ft", f"₹{price_per_sqft:.0f}")
             
-            # Price range estimate
-            lower_bound = int(st.session_state.last_prediction * 0.9)
-            upper_bound = int(st.session_state.last_prediction * 1.1)
+            # Price range from the spread of the model's trees
+            lower_bound, upper_bound = st.session_state.last_range
             st.info(f"**Price Range:** ₹{lower_bound:,} - ₹{upper_bound:,}")
             
+            # What-if: price against area for the same city and rooms
+            inputs = st.session_state.last_inputs
+            surface = get_price_surface(st.session_state.model_version, registry.store)
+            curve = surface.area_curve(
+                inputs['location'], inputs['bedrooms'], inputs['bathrooms']
+            ) if surface is not None else None
+            if curve is not None:
+                areas, prices, _, _ = curve
+                st.line_chart({'Area (sq ft)': areas, 'Estimated price (₹)': prices},
+                              x='Area (sq ft)', y='Estimated price (₹)', height=220)
+            
             # Market insights
             st.markdown("### 📊 Market Insights")
             
-            # Similar properties comparison
-            similar_props = st.session_state.market_data[
-                (st.session_state.market_data['bedrooms'] == st.session_state.last_inputs['bedrooms']) &
-                (st.session_state.market_data['location'] == st.session_state.last_inputs['location'])
-            ]
+            # Compare with the nearest comparable homes in the same city
+            comparables_index = get_registry().get_derived('comparables', ComparablesIndex.build)
+            comparables = comparables_index.summary(
+                inputs['location'], inputs['area'], inputs['bedrooms'], inputs['bathrooms']
+            ) if comparables_index is not None else None
             
-            if len(similar_props) > 0:
-                avg_similar = similar_props['price'].mean()
-                if st.session_state.last_prediction > avg_similar:
-                    st.success(f"📈 Above average for similar homes (₹{avg_similar:,.0f})")
+            if comparables is not None:
+                median_similar = comparables['median_price']
+                if st.session_state.last_prediction > median_similar:
+                    st.success(f"📈 Above the median of {comparables['count']} comparable homes (₹{median_similar:,.0f})")
                 else:
-                    st.info(f"📊 Below average for similar homes (₹{avg_similar:,.0f})")
+                    st.info(f"📊 Below the median of {comparables['count']} comparable homes (₹{median_similar:,.0f})")
+                per_sqft = comparables['price_per_sqft']
+                st.caption(f"Comparables: ₹{per_sqft['p25']:,.0f} - ₹{per_sqft['p75']:,.0f} per sq ft "
+                           f"(median ₹{per_sqft['median']:,.0f})")
             
         else:
             st.info("👆 Enter your home details and click 'Get Price Estimate' to see the estimated value")
@@ -403,189 +367,23 @@ def main():
         tab1, tab2, tab3 = st.tabs(["🏗️ Top Builders", "🏠 Property Overview", "🎥 Virtual Tour"])
         
         with tab1:
-            st.subheader(f"Top Builders in {st.session_state.selected_city}")
-            
-            if st.session_state.builders_data:
-                for i, builder in enumerate(st.session_state.builders_data):
-                    with st.expander(f"⭐ {builder['name']} - Rating: {builder['rating']}/5"):
-                        col1, col2 = st.columns([2, 1])
-                        
-                        with col1:
-                            st.write(f"**Experience:** {builder['experience']}")
-                            st.write(f"**Specialty:** {builder['specialty']}")
-                            st.write(f"**Popular Projects:**")
-                            for project in builder['projects']:
-                                st.write(f"• {project}")
-                        
-                        with col2:
-                            st.metric("Rating", f"{builder['rating']}/5")
-                            if st.button(f"Contact {builder['name']}", key=f"contact_{i}"):
-                                st.success(f"Contact information for {builder['name']} sent to your email!")
+            show_builders(st.session_state.selected_city, st.session_state.builders_data)
         
         with tab2:
-            st.subheader("Property Overview & Amenities")
-            
-            features = st.session_state.property_features
-            
-            # Property specifications
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("#### 📋 Property Specifications")
-                for key, value in features['specifications'].items():
-                    st.write(f"**{key}:** {value}")
-            
-            with col2:
-                st.markdown("#### 🏊 Amenities & Facilities")
-                # Display amenities in a grid-like format
-                amenities_text = ""
-                for i, amenity in enumerate(features['amenities']):
-                    amenities_text += f"• {amenity}\n"
-                st.text(amenities_text)
-            
-            # Investment insights
-            st.markdown("#### 💡 Investment Insights")
-            price_per_sqft = st.session_state.last_prediction / st.session_state.last_inputs['area']
-            
-            if price_per_sqft > 8000:
-                investment_grade = "Premium"
-                investment_color = "green"
-            elif price_per_sqft > 5000:
-                investment_grade = "Good"
-                investment_color = "orange"
-            else:
-                investment_grade = "Budget-Friendly"
-                investment_color = "blue"
-            
-            st.markdown(f"**Investment Grade:** :{investment_color}[{investment_grade}]")
-            
-            # Location advantages
-            tier_1_cities = ['Mumbai', 'Delhi', 'Bangalore', 'Chennai', 'Hyderabad', 'Pune', 'Kolkata']
-            if st.session_state.selected_city in tier_1_cities:
-                location_benefits = [
-                    "Well-connected public transport",
-                    "Close to IT/business hubs",
-                    "Good educational institutions nearby",
-                    "Healthcare facilities available",
-                    "Shopping and entertainment options"
-                ]
-            else:
-                location_benefits = [
-                    "Growing infrastructure",
-                    "Affordable pricing",
-                    "Peaceful residential area",
-                    "Good connectivity to main city",
-                    "Future development potential"
-                ]
-            
-            st.markdown("**Location Benefits:**")
-            for benefit in location_benefits:
-                st.write(f"✅ {benefit}")
+            show_property_overview(
+                st.session_state.property_features,
+                st.session_state.last_prediction / st.session_state.last_inputs['area'],
+                st.session_state.selected_city
+            )
         
         with tab3:
-            st.subheader("Virtual Property Tour")
-            
-            # Create a mock virtual tour interface
-            st.markdown("#### 🎮 Interactive Property Walkthrough")
-            
-            tour_options = st.selectbox(
-                "Choose a room to explore:",
-                ["Living Room", "Master Bedroom", "Kitchen", "Bathroom", "Balcony", "Common Areas"]
-            )
-            
-            # Mock virtual tour descriptions
-            tour_descriptions = {
-                "Living Room": {
-                    "description": "Spacious living area with modern flooring and large windows providing natural light. Perfect for family gatherings and entertainment.",
-                    "features": ["Large windows", "Modern flooring", "Ceiling fan", "TV unit space", "Seating area"]
-                },
-                "Master Bedroom": {
-                    "description": "Comfortable master bedroom with attached bathroom and wardrobe space. Designed for privacy and relaxation.",
-                    "features": ["Queen/King bed space", "Attached bathroom", "Built-in wardrobe", "Window with view", "AC provision"]
-                },
-                "Kitchen": {
-                    "description": "Well-planned kitchen with modern fittings and ample storage space. Designed for convenient cooking and food preparation.",
-                    "features": ["Modular design", "Storage cabinets", "Platform space", "Exhaust provision", "Water connection"]
-                },
-                "Bathroom": {
-                    "description": "Modern bathroom with quality fittings and proper ventilation. Clean and hygienic design.",
-                    "features": ["Modern fixtures", "Hot water provision", "Ventilation", "Storage space", "Quality tiles"]
-                },
-                "Balcony": {
-                    "description": "Private balcony space offering outdoor relaxation and fresh air. Perfect for morning coffee or evening relaxation.",
-                    "features": ["Outdoor space", "Safety grills", "City/garden view", "Drying area", "Fresh air circulation"]
-                },
-                "Common Areas": {
-                    "description": "Well-maintained common areas including lobby, corridors, and amenity spaces. Designed for community living.",
-                    "features": ["Security desk", "Mailbox area", "Elevator access", "Common utilities", "Maintenance room"]
-                }
-            }
-            
-            if tour_options in tour_descriptions:
-                tour_info = tour_descriptions[tour_options]
-                
-                st.markdown(f"#### 📍 {tour_options}")
-                st.write(tour_info["description"])
-                
-                st.markdown("**Key Features:**")
-                for feature in tour_info["features"]:
-                    st.write(f"• {feature}")
-                
-                # Mock 360-degree view button
-                if st.button(f"🔄 360° View of {tour_options}", use_container_width=True):
-                    st.success(f"Loading 360° virtual tour of {tour_options}...")
-                    st.balloons()
-            
-            # Booking section
-            st.markdown("---")
-            st.markdown("#### 📅 Schedule a Site Visit")
-            
-            visit_col1, visit_col2 = st.columns(2)
-            
-            with visit_col1:
-                visit_date = st.date_input("Preferred Visit Date")
-                visit_time = st.selectbox("Preferred Time", ["10:00 AM", "12:00 PM", "2:00 PM", "4:00 PM", "6:00 PM"])
-            
-            with visit_col2:
-                visitor_name = st.text_input("Your Name")
-                visitor_phone = st.text_input("Phone Number")
-            
-            if st.button("📋 Schedule Site Visit", type="primary", use_container_width=True):
-                if visitor_name and visitor_phone:
-                    st.success(f"Site visit scheduled for {visit_date} at {visit_time}. Confirmation details sent to your phone!")
-                else:
-                    st.error("Please provide your name and phone number to schedule a visit.")
+            show_virtual_tour()
     
     # Market data visualization
-    if st.session_state.market_data is not None:
-        st.markdown("---")
-        st.subheader("📈 Current Market Trends")
-        
-        viz_col1, viz_col2 = st.columns(2)
-        
-        with viz_col1:
-            # Price by location
-            avg_by_location = st.session_state.market_data.groupby('location')['price'].mean().reset_index()
-            fig1 = px.bar(
-                avg_by_location,
-                x='location',
-                y='price',
-                title="Average Price by Location",
-                labels={'price': 'Average Price ($)', 'location': 'Location'}
-            )
-            fig1.update_layout(xaxis_tickangle=45)
-            st.plotly_chart(fig1, use_container_width=True)
-        
-        with viz_col2:
-            # Price distribution
-            fig2 = px.histogram(
-                st.session_state.market_data,
-                x='price',
-                nbins=30,
-                title="Market Price Distribution",
-                labels={'price': 'Price ($)', 'count': 'Number of Properties'}
-            )
-            st.plotly_chart(fig2, use_container_width=True)
+    if market_data is not None:
+        show_market_trends(registry)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Each Streamlit rerun is one instrumented request
+    with instrumentation.request('app_run'):
+        main()
\ No newline at end of file
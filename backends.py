@@ -0,0 +1,52 @@
+"""
+Pluggable regression backends for the price model.
+
+Every backend is a scikit-learn style regressor trained on the four
+FEATURE_COLUMNS (area, bedrooms, bathrooms, location_encoded). Factories take
+the shared hyperparameters as keywords and ignore the ones they do not use.
+"""
+DEFAULT_BACKEND = 'random_forest'
+
+# Column index of the encoded location in the feature matrix
+LOCATION_COLUMN = 3
+
+
+# scikit-learn is imported inside the factories so importing this module (and
+# predicting from an already loaded model) does not pay for it at startup
+
+def _random_forest(n_estimators=100, random_state=42, n_jobs=-1, **_):
+    from sklearn.ensemble import RandomForestRegressor
+    return RandomForestRegressor(n_estimators=n_estimators, random_state=random_state, n_jobs=n_jobs)
+
+
+def _hist_gradient_boosting(random_state=42, max_iter=300, **_):
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    # Location codes are categories, not an ordered quantity
+    return HistGradientBoostingRegressor(
+        max_iter=max_iter,
+        categorical_features=[LOCATION_COLUMN],
+        random_state=random_state,
+    )
+
+
+def _location_linear(**_):
+    from location_linear import LocationLinearRegressor
+    return LocationLinearRegressor()
+
+
+BACKENDS = {
+    'random_forest': _random_forest,
+    'hist_gradient_boosting': _hist_gradient_boosting,
+    'location_linear': _location_linear,
+}
+
+
+def make_estimator(backend=DEFAULT_BACKEND, **params):
+    """
+    Unfitted regressor for a backend name
+    """
+    try:
+        factory = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown model backend '{backend}', expected one of: {', '.join(BACKENDS)}")
+    return factory(**params)
@@ -0,0 +1,234 @@
+"""
+Background training with atomic hot swap of the served model.
+
+Training runs on a single background thread. Until a new version is ready,
+every session keeps serving the previous model; ModelRegistry.publish then
+swaps the dataset and model in together, and the price surface for the new
+version (see price_surface.py) is built right after. On startup the latest stored
+artifact is served immediately, even past its max_age, and refreshed in the
+background. Only a process with nothing stored waits for its first model.
+
+Newly arrived rows go through BackgroundTrainer.append, which grows extra
+trees with them (ModelRegistry.append_market_data) on the same thread as the
+retrains. Full retrains in the same process keep those rows. A restarted
+process trains on its source again, so rows that should outlive it belong
+in LISTINGS_DIR.
+
+Both kinds of fit go through training.py; status()['last_report'] holds the
+report (fit time, peak memory, model size) of the latest one.
+
+Environment:
+    MODEL_RETRAIN_INTERVAL=3600   retrain every N seconds (off by default)
+"""
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+
+from ingest import load_market_data, market_source
+from model_registry import get_registry, model_key
+from price_model import MODEL_PARAMS
+from price_surface import ensure_price_surface, get_price_surface
+from training import train_with_report
+
+logger = logging.getLogger(__name__)
+
+RETRAIN_INTERVAL = float(os.environ.get('MODEL_RETRAIN_INTERVAL', 0) or 0)
+
+
+class BackgroundTrainer:
+    """
+    Runs retrains off the request path and reports their status.
+
+    At most one retrain runs at a time; asking for another while one is in
+    flight returns the running one. ``interval`` (seconds) starts a periodic
+    retrain schedule. ``trainer`` replaces the default train_with_report
+    fit; its runs have no report.
+    """
+
+    def __init__(self, registry, loader=load_market_data, source='synthetic', params=None, interval=None,
+                 trainer=None):
+        self.registry = registry
+        self.loader = loader
+        self.source = source
+        self.params = dict(params or MODEL_PARAMS)
+        self.interval = interval or None
+        self.trainer = trainer or self._train
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='model-training')
+        self._future = None
+        # Rows added through append(), kept so full retrains do not drop them
+        self._appended = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._status = {
+            'state': 'idle',
+            'version': None,
+            'runs': 0,
+            'unchanged': 0,
+            'refreshes': 0,
+            'failures': 0,
+            'last_reason': None,
+            'last_error': None,
+            'started_at': None,
+            'finished_at': None,
+            'last_duration_seconds': None,
+            'last_report': None,
+            'next_run_at': None,
+        }
+
+    def start(self):
+        """
+        Serve whatever is stored, then train in the background if that is
+        missing or stale, and start the periodic schedule
+        """
+        fresh = self.registry.warm_start(self.source, **self.params)
+        entry = self.serving()
+        if entry is not None:
+            self._update(version=entry[0][0])
+            if get_price_surface(entry[0], self.registry.store) is None:
+                self._executor.submit(self._build_surface, entry)
+        if not fresh:
+            self.retrain('startup' if fresh is None else 'stale artifact')
+        if self.interval:
+            threading.Thread(target=self._schedule, name='model-retrain-schedule', daemon=True).start()
+        return self
+
+    def serving(self):
+        """
+        ``(key, model, label_encoder)`` currently served, or None; never trains
+        """
+        data, fingerprint = self.registry.current_market_data()
+        if data is None:
+            return None
+        key = model_key(fingerprint, self.params)
+        entry = self.registry.get(key)
+        return None if entry is None else (key,) + entry
+
+    def retrain(self, reason='manual'):
+        """
+        Queue a retrain on fresh data and return its future
+        """
+        with self._lock:
+            if self._future is not None and not self._future.done():
+                return self._future
+            self._future = self._executor.submit(self._run, reason)
+            return self._future
+
+    def append(self, new_rows, extra_trees=25):
+        """
+        Queue an incremental refresh with newly arrived market rows and return
+        its future; it runs after any retrain already queued
+        """
+        return self._executor.submit(self._append, new_rows, extra_trees)
+
+    def wait_for_model(self, timeout=None):
+        """
+        Return the served model, waiting for a retrain (started if none is
+        running, e.g. after a failure) when there is none yet
+        """
+        entry = self.serving()
+        if entry is None:
+            concurrent.futures.wait([self.retrain('no model')], timeout)
+            entry = self.serving()
+        return entry
+
+    def status(self):
+        with self._lock:
+            return dict(self._status)
+
+    def stop(self):
+        self._stop.set()
+        self._executor.shutdown(wait=False)
+
+    def _update(self, **fields):
+        with self._lock:
+            self._status.update(fields)
+
+    def _run(self, reason):
+        started = time.time()
+        self._update(state='training', last_reason=reason, started_at=started)
+        try:
+            data = self.loader()
+            if data is None or len(data) == 0:
+                raise RuntimeError("no market data to train on")
+            with self._lock:
+                appended = list(self._appended)
+            if appended:
+                data = pd.concat([data] + [rows[data.columns] for rows in appended], ignore_index=True)
+            key, trained = self.registry.publish(data, self.trainer, source=self.source, **self.params)
+        except Exception as e:
+            logger.exception("Background retrain (%s) failed", reason)
+            with self._lock:
+                self._status['failures'] += 1
+                self._status.update(state='failed', last_error=str(e), finished_at=time.time(),
+                                    last_duration_seconds=round(time.time() - started, 3))
+            return None
+        with self._lock:
+            # 'runs' counts models actually fitted; unchanged data reuses the served model
+            self._status['runs' if trained else 'unchanged'] += 1
+            self._status.update(state='idle', version=key[0], last_error=None, finished_at=time.time(),
+                                last_duration_seconds=round(time.time() - started, 3))
+        if trained:
+            logger.info("Model version %s is live (%s)", key[0], reason)
+        else:
+            logger.info("Market data unchanged, model version %s kept (%s)", key[0], reason)
+        entry = self.registry.get(key)
+        if entry is not None:
+            # A refit under the same key replaces the artifact directory, surface included
+            self._build_surface((key,) + entry, rebuild=trained)
+        return key
+
+    def _append(self, new_rows, extra_trees):
+        try:
+            key, model, label_encoder = self.registry.append_market_data(new_rows, extra_trees=extra_trees,
+                                                                         **self.params)
+        except Exception as e:
+            logger.exception("Incremental refresh with %d rows failed", len(new_rows))
+            with self._lock:
+                self._status['failures'] += 1
+                self._status.update(last_error=str(e))
+            raise
+        with self._lock:
+            self._appended.append(new_rows)
+            self._status['refreshes'] += 1
+            self._status.update(version=key[0], last_error=None, last_report=self.registry.last_refresh_report)
+        self._build_surface((key, model, label_encoder))
+        return key
+
+    def _train(self, data, **params):
+        model, label_encoder, report = train_with_report(data, **params)
+        self._update(last_report=report)
+        return model, label_encoder
+
+    def _build_surface(self, entry, rebuild=False):
+        key, model, label_encoder = entry
+        try:
+            ensure_price_surface(key, model, label_encoder, self.registry.store, rebuild=rebuild)
+        except Exception:
+            # Estimates fall back to live predictions without a surface
+            logger.exception("Could not build the price surface for %s", key[0])
+
+    def _schedule(self):
+        while True:
+            self._update(next_run_at=time.time() + self.interval)
+            if self._stop.wait(self.interval):
+                return
+            self.retrain('scheduled')
+
+
+_trainer = None
+_trainer_lock = threading.Lock()
+
+
+def get_trainer():
+    """
+    Process-wide trainer for the shared registry, started on first use
+    """
+    global _trainer
+    with _trainer_lock:
+        if _trainer is None:
+            _trainer = BackgroundTrainer(get_registry(), source=market_source(), interval=RETRAIN_INTERVAL).start()
+        return _trainer
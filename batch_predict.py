@@ -0,0 +1,119 @@
+"""
+Bulk property valuation without Streamlit.
+
+Usage:
+    python batch_predict.py listings.csv valuations.csv
+    python batch_predict.py listings.parquet valuations.parquet --chunk-size 100000
+    python batch_predict.py listings.jsonl valuations.jsonl
+    python batch_predict.py listings.csv valuations.csv --interval   # adds price_low/price_high
+"""
+import argparse
+import sys
+import time
+
+from ingest import file_format, iter_chunks, require_pyarrow
+from model_registry import ModelRegistry, load_serving_model
+from model_store import DEFAULT_ARTIFACT_DIR, ModelStore
+from price_model import predict_price_ranges, predict_prices
+
+INPUT_COLUMNS = ['area', 'bedrooms', 'bathrooms', 'location']
+OUTPUT_COLUMN = 'estimated_price'
+INTERVAL_COLUMNS = ['price_low', 'price_high']
+
+
+class _ChunkWriter:
+    """
+    Append-only CSV, JSONL or Parquet writer so results never sit in memory as a whole
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.format = file_format(path)
+        self._parquet = None
+        self._started = False
+
+    def write(self, frame):
+        mode = 'a' if self._started else 'w'
+        if self.format == 'csv':
+            frame.to_csv(self.path, mode=mode, header=not self._started, index=False)
+            self._started = True
+            return
+        if self.format == 'jsonl':
+            with open(self.path, mode) as f:
+                frame.to_json(f, orient='records', lines=True)
+            self._started = True
+            return
+
+        pa = require_pyarrow()
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if self._parquet is None:
+            self._parquet = pa.parquet.ParquetWriter(self.path, table.schema)
+        self._parquet.write_table(table)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def value_portfolio(input_path, output_path, model, label_encoder, chunk_size=50000, interval=False):
+    """
+    Value every listing in ``input_path`` and stream results to ``output_path``.
+
+    Input rows keep all their columns and gain an ``estimated_price`` column,
+    plus ``price_low`` and ``price_high`` when ``interval`` is set.
+    Returns the number of rows written.
+    """
+    writer = _ChunkWriter(output_path)
+    n_rows = 0
+    try:
+        for chunk in iter_chunks(input_path, chunk_size):
+            missing = [c for c in INPUT_COLUMNS if c not in chunk.columns]
+            if missing:
+                raise ValueError(f"Input is missing required columns: {', '.join(missing)}")
+            if interval:
+                prices, lower, upper = predict_price_ranges(model, label_encoder, chunk, chunk_size=chunk_size)
+                chunk[OUTPUT_COLUMN] = prices
+                chunk[INTERVAL_COLUMNS[0]] = lower
+                chunk[INTERVAL_COLUMNS[1]] = upper
+            else:
+                chunk[OUTPUT_COLUMN] = predict_prices(model, label_encoder, chunk, chunk_size=chunk_size)
+            writer.write(chunk)
+            n_rows += len(chunk)
+    finally:
+        writer.close()
+    return n_rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estimate prices for a file of property listings")
+    parser.add_argument('input', help="CSV, JSONL or Parquet file with area, bedrooms, bathrooms and location columns")
+    parser.add_argument('output', help="CSV, JSONL or Parquet file to write valuations to")
+    parser.add_argument('--chunk-size', type=int, default=50000, help="rows held in memory at a time")
+    parser.add_argument('--jobs', type=int, default=-1, help="cores used for prediction (-1 for all)")
+    parser.add_argument('--artifact-dir', default=DEFAULT_ARTIFACT_DIR, help="model artifact directory")
+    parser.add_argument('--interval', action='store_true', help="add price_low/price_high from the tree spread")
+    args = parser.parse_args(argv)
+    # Fail before loading the model rather than after the first chunk
+    try:
+        if 'parquet' in (file_format(args.input), file_format(args.output)):
+            require_pyarrow()
+    except ImportError as e:
+        print(e)
+        return 1
+
+    registry = ModelRegistry(store=ModelStore(args.artifact_dir) if args.artifact_dir else None)
+    _, model, label_encoder = load_serving_model(registry)
+    # Trees are scored in parallel threads; this process owns the model
+    if 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=args.jobs)
+
+    start = time.perf_counter()
+    n_rows = value_portfolio(args.input, args.output, model, label_encoder, chunk_size=args.chunk_size,
+                             interval=args.interval)
+    elapsed = time.perf_counter() - start
+    print(f"Valued {n_rows:,} properties in {elapsed:.2f}s ({n_rows / max(elapsed, 1e-9):,.0f} rows/s) -> {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Compare price model backends on generated market data.
+
+Usage:
+    python benchmarks/bench_backends.py [--rows 20000] [--batch 100000] [--json]
+
+Reports fit time, single-row and batch prediction latency, serialized size
+and holdout accuracy so the cheapest backend meeting the accuracy target can
+be selected with PRICE_MODEL_BACKEND.
+"""
+import argparse
+import json
+import os
+import pickle
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backends import BACKENDS  # noqa: E402
+from market_data import generate_market_data  # noqa: E402
+from price_model import predict_price, predict_prices, train_price_model  # noqa: E402
+
+
+def bench_backend(backend, train, holdout, batch, single_calls):
+    start = time.perf_counter()
+    model, label_encoder = train_price_model(train, backend=backend)
+    fit_seconds = time.perf_counter() - start
+
+    singles = []
+    rows = holdout.head(single_calls).itertuples(index=False)
+    for row in rows:
+        start = time.perf_counter()
+        predict_price(model, label_encoder, row.area, row.bedrooms, row.bathrooms, row.location)
+        singles.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    predict_prices(model, label_encoder, batch)
+    batch_seconds = time.perf_counter() - start
+
+    predicted = predict_prices(model, label_encoder, holdout).astype(float)
+    actual = holdout['price'].to_numpy(dtype=float)
+    errors = predicted - actual
+    return {
+        'backend': backend,
+        'fit_seconds': round(fit_seconds, 4),
+        'single_p50_ms': round(statistics.median(singles) * 1000, 4),
+        'batch_rows': len(batch),
+        'batch_seconds': round(batch_seconds, 4),
+        'batch_rows_per_second': round(len(batch) / batch_seconds),
+        'size_bytes': len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)),
+        'mae': round(float(np.abs(errors).mean())),
+        'mape_pct': round(float(np.abs(errors / actual).mean() * 100), 3),
+        'r2': round(float(1 - (errors ** 2).sum() / ((actual - actual.mean()) ** 2).sum()), 4),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare price model backends")
+    parser.add_argument('--rows', type=int, default=20000, help="training rows")
+    parser.add_argument('--holdout', type=int, default=5000, help="rows used for accuracy")
+    parser.add_argument('--batch', type=int, default=100000, help="rows in the batch latency test")
+    parser.add_argument('--single-calls', type=int, default=200)
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument('--json', action='store_true', help="print one JSON object per backend")
+    args = parser.parse_args(argv)
+
+    train = generate_market_data(args.rows, seed=1)
+    holdout = generate_market_data(args.holdout, seed=2)
+    batch = generate_market_data(args.batch, seed=3)
+
+    results = [bench_backend(b, train, holdout, batch, args.single_calls) for b in args.backends]
+    if args.json:
+        for result in results:
+            print(json.dumps(result))
+        return
+
+    header = f"{'backend':<24}{'fit s':>9}{'1-row ms':>10}{'batch rows/s':>14}{'size KB':>12}{'MAPE %':>9}{'R2':>8}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['backend']:<24}{r['fit_seconds']:>9.3f}{r['single_p50_ms']:>10.3f}"
+              f"{r['batch_rows_per_second']:>14,}{r['size_bytes'] / 1024:>12,.1f}{r['mape_pct']:>9.2f}{r['r2']:>8.4f}")
+
+
+if __name__ == '__main__':
+    main()
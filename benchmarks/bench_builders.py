@@ -0,0 +1,70 @@
+"""
+Per-call cost of builders lookups before and after the indexed catalog.
+
+Usage:
+    python benchmarks/bench_builders.py [--calls 20000]
+
+"before" mimics the original get_builders_data(), which rebuilt the whole
+nested dict-of-lists-of-dicts literal on every call and returned one city.
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from builders import BUILDERS_FILE, BuilderCatalog, get_builder_catalog  # noqa: E402
+
+
+def make_legacy_lookup():
+    with open(BUILDERS_FILE, encoding='utf-8') as f:
+        raw = json.load(f)
+    experience = {b['name']: b['experience'] for b in raw['builders']}
+    # Frozen rows stand in for the literal's constants
+    rows = {
+        city: tuple((e['builder'], tuple(e['projects']), e['rating'], experience[e['builder']], e['specialty'])
+                    for e in entries)
+        for city, entries in list(raw['cities'].items()) + [('*', raw['default'])]
+    }
+
+    def legacy_get_builders_data(city):
+        database = {
+            c: [{'name': n, 'projects': list(p), 'rating': r, 'experience': x, 'specialty': s}
+                for n, p, r, x, s in entries]
+            for c, entries in rows.items()
+        }
+        default_builders = database.pop('*')
+        return database.get(city, default_builders)
+
+    return legacy_get_builders_data
+
+
+def per_call_us(fn, calls):
+    return min(timeit.repeat(fn, number=calls, repeat=5)) / calls * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calls', type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    legacy = make_legacy_lookup()
+    catalog = get_builder_catalog()
+    cities = ['Mumbai', 'Pune', 'Varanasi']
+
+    load_ms = min(timeit.repeat(BuilderCatalog.from_file, number=10, repeat=3)) / 10 * 1000
+    print(f"catalog load (once per process): {load_ms:.3f} ms")
+    for city in cities:
+        before = per_call_us(lambda: legacy(city), args.calls)
+        after = per_call_us(lambda: catalog.for_city(city), args.calls)
+        print(f"{city:<10} before {before:8.2f} us/call   after {after:6.3f} us/call   {before / after:7.0f}x")
+
+    find = per_call_us(lambda: catalog.find('Bangalore', min_rating=4.2), args.calls)
+    by_name = per_call_us(lambda: catalog.by_builder('Godrej Properties'), args.calls)
+    print(f"find(min_rating=4.2): {find:.3f} us/call   by_builder(): {by_name:.3f} us/call")
+
+
+if __name__ == '__main__':
+    main()
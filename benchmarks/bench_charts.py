@@ -0,0 +1,91 @@
+"""
+Market chart payload size and render cost by dataset size.
+
+Usage:
+    python benchmarks/bench_charts.py [--rows 500 50000 1000000] [--json]
+
+For each dataset size reports the serialized JSON size of the two market
+figures sent to the browser, the one-off cost of building them from the
+MarketIndex (the app caches the figures per dataset version), and the
+per-rerun cost of encoding them in st.plotly_chart. For comparison it also
+reports the payload of the old ``px.histogram`` over raw prices, which grows
+with the row count.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_charts import build_market_figures, figure_json  # noqa: E402
+from market_data import generate_market_data  # noqa: E402
+from market_index import MarketIndex  # noqa: E402
+
+
+def _best_of(function, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def raw_histogram_bytes(data):
+    import plotly.express as px
+    figure = px.histogram(data, x='price', nbins=30, title="Market Price Distribution")
+    return len(figure_json(figure))
+
+
+def bench_charts(n_rows, legacy_max_rows):
+    data = generate_market_data(n_rows, seed=0)
+    start = time.perf_counter()
+    market_index = MarketIndex.build(data)
+    index_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    figures = build_market_figures(market_index)
+    specs = [figure_json(figure) for figure in figures]
+    build_seconds = time.perf_counter() - start
+
+    encode_seconds = _best_of(lambda: [figure_json(figure) for figure in figures])
+    return {
+        'rows': n_rows,
+        'payload_bytes': sum(len(spec) for spec in specs),
+        'index_seconds': round(index_seconds, 4),
+        'build_seconds': round(build_seconds, 4),
+        'encode_per_rerun_ms': round(encode_seconds * 1000, 3),
+        'raw_histogram_bytes': raw_histogram_bytes(data) if n_rows <= legacy_max_rows else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure market chart payloads and render cost")
+    parser.add_argument('--rows', type=int, nargs='+', default=[500, 50000, 1000000])
+    parser.add_argument('--legacy-max-rows', type=int, default=1000000,
+                        help="largest dataset to build the raw-price histogram for")
+    parser.add_argument('--json', action='store_true', help="print one JSON object per size")
+    args = parser.parse_args(argv)
+    warnings.simplefilter('ignore')
+
+    results = [bench_charts(n, args.legacy_max_rows) for n in args.rows]
+    if args.json:
+        for result in results:
+            print(json.dumps(result))
+        return 0
+
+    header = f"{'rows':>10}{'payload KB':>12}{'build s':>10}{'encode ms':>11}{'raw histogram KB':>18}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        raw = f"{r['raw_histogram_bytes'] / 1024:,.1f}" if r['raw_histogram_bytes'] is not None else '-'
+        print(f"{r['rows']:>10,}{r['payload_bytes'] / 1024:>12.1f}{r['build_seconds']:>10.3f}"
+              f"{r['encode_per_rerun_ms']:>11.2f}{raw:>18}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Comparables index against the original "similar homes" mask filter.
+
+Usage:
+    python benchmarks/bench_comparables.py [--rows 500 100000 1000000 5000000] [--json]
+
+For each dataset size reports the index build time and per-query latency of
+the old mask filter (exact location and bedrooms match over every row), an
+exact k-nearest full scan and the ComparablesIndex. The index results are
+checked against the full scan first, including on bedroom and bathroom counts
+up to ingest's limit of 20.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from columnar import compact_market_frame  # noqa: E402
+from comparables import AREA_SCALE, DEFAULT_K, ComparablesIndex  # noqa: E402
+from market_data import generate_market_data  # noqa: E402
+
+
+def mask_filter(data, location, bedrooms):
+    """
+    The original full-scan definition of similar homes, kept as the benchmark baseline
+    """
+    similar = data[(data['location'] == location) & (data['bedrooms'] == bedrooms)]
+    return similar['price'].mean() if len(similar) > 0 else None
+
+
+def brute_force_nearest(data, location, area, bedrooms, bathrooms, k=DEFAULT_K):
+    """
+    Exact k nearest by full scan, used to check and benchmark the index
+    """
+    in_city = np.flatnonzero((data['location'] == location).to_numpy())
+    distances = (
+        ((data['area'].to_numpy(dtype=float)[in_city] - area) / AREA_SCALE) ** 2
+        + (data['bedrooms'].to_numpy(dtype=float)[in_city] - bedrooms) ** 2
+        + (data['bathrooms'].to_numpy(dtype=float)[in_city] - bathrooms) ** 2
+    )
+    return np.sort(distances)[:k]
+
+
+def check_wide_ranges(k=DEFAULT_K):
+    """
+    Check the index against a full scan on the whole bedroom and bathroom
+    range ingest accepts (1-20), not only the synthetic 1-5, with compact dtypes
+    """
+    rng = np.random.default_rng(2)
+    n_rows = 5000
+    bedrooms = rng.integers(1, 21, size=n_rows)
+    data = compact_market_frame(pd.DataFrame({
+        'area': rng.integers(300, 20000, size=n_rows),
+        'bedrooms': bedrooms,
+        'bathrooms': np.minimum(bedrooms + rng.choice([-0.5, 0.0, 1.0], size=n_rows), 20).clip(0.5),
+        'location': rng.choice(['Pune', 'Delhi'], size=n_rows),
+        'price': rng.integers(10 ** 5, 10 ** 8, size=n_rows),
+    }))
+    index = ComparablesIndex.build(data)
+    for bedrooms, bathrooms in [(1, 1.0), (2, 2.0), (20, 20.0), (10, 0.5)]:
+        for area in (300, 1010, 9000, 20000):
+            expected = brute_force_nearest(data, 'Pune', area, bedrooms, bathrooms, k)
+            _, found = index.nearest('Pune', area, bedrooms, bathrooms, k)
+            if not np.allclose(found, expected):
+                raise AssertionError(f"index disagrees with full scan for {bedrooms} bedrooms, {area} sq ft")
+
+
+def _per_query_ms(function, queries):
+    start = time.perf_counter()
+    for query in queries:
+        function(*query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the comparables index against the mask filter")
+    parser.add_argument('--rows', type=int, nargs='+', default=[500, 100000, 1000000, 5000000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=DEFAULT_K)
+    parser.add_argument('--json', action='store_true', help="print one JSON object per size")
+    args = parser.parse_args(argv)
+
+    check_wide_ranges(args.k)
+    results = []
+    for n_rows in args.rows:
+        data = generate_market_data(n_rows, seed=0)
+        start = time.perf_counter()
+        index = ComparablesIndex.build(data)
+        build_seconds = time.perf_counter() - start
+
+        rng = np.random.default_rng(1)
+        sample = data.iloc[rng.integers(0, n_rows, size=args.queries)]
+        queries = [(str(r.location), float(r.area) + 25, int(r.bedrooms), float(r.bathrooms))
+                   for r in sample.itertuples(index=False)]
+        # Distances must match an exact full scan
+        for location, area, bedrooms, bathrooms in queries[:20]:
+            expected = brute_force_nearest(data, location, area, bedrooms, bathrooms, args.k)
+            _, found = index.nearest(location, area, bedrooms, bathrooms, args.k)
+            if not np.allclose(found, expected):
+                raise AssertionError(f"index disagrees with full scan for {location}, {area}")
+
+        results.append({
+            'rows': n_rows,
+            'build_seconds': round(build_seconds, 4),
+            'mask_filter_ms': round(_per_query_ms(lambda l, a, b, t: mask_filter(data, l, b), queries[:50]), 4),
+            'full_scan_knn_ms': round(_per_query_ms(
+                lambda l, a, b, t: brute_force_nearest(data, l, a, b, t, args.k), queries[:50]), 4),
+            'index_knn_ms': round(_per_query_ms(lambda l, a, b, t: index.nearest(l, a, b, t, args.k), queries), 4),
+            'index_summary_ms': round(_per_query_ms(lambda l, a, b, t: index.summary(l, a, b, t, args.k), queries), 4),
+        })
+
+    if args.json:
+        for result in results:
+            print(json.dumps(result))
+        return 0
+    header = f"{'rows':>10}{'build s':>10}{'mask ms':>10}{'scan kNN ms':>13}{'index kNN ms':>14}{'summary ms':>12}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['rows']:>10,}{r['build_seconds']:>10.3f}{r['mask_filter_ms']:>10.3f}{r['full_scan_knn_ms']:>13.3f}"
+              f"{r['index_knn_ms']:>14.4f}{r['index_summary_ms']:>12.4f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Latency cost of forest prediction intervals.
+
+Usage:
+    python benchmarks/bench_intervals.py [--rows 20000] [--batch 100000] [--budget-ms 5] [--json]
+
+Times predict_price against predict_price_range for single requests and
+predict_prices against predict_price_ranges for a batch, and exits 1 if the
+added p95 latency of a single request exceeds ``--budget-ms``.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_data import generate_market_data  # noqa: E402
+from price_model import (  # noqa: E402
+    predict_price, predict_price_range, predict_price_ranges, predict_prices, train_price_model,
+)
+
+
+def _latencies(function, rows):
+    timings = []
+    for row in rows:
+        start = time.perf_counter()
+        function(row.area, row.bedrooms, row.bathrooms, row.location)
+        timings.append(time.perf_counter() - start)
+    return np.array(timings) * 1000
+
+
+def _timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def bench_intervals(model, label_encoder, requests, batch):
+    rows = list(requests.itertuples(index=False))
+    # Warm up the leaf table and sklearn's input validation once
+    predict_price_range(model, label_encoder, 1500, 3, 2, 'Pune')
+
+    point = _latencies(lambda *inputs: predict_price(model, label_encoder, *inputs), rows)
+    ranged = _latencies(lambda *inputs: predict_price_range(model, label_encoder, *inputs), rows)
+    batch_point = _timed(lambda: predict_prices(model, label_encoder, batch))
+    batch_ranged = _timed(lambda: predict_price_ranges(model, label_encoder, batch))
+
+    p95_point, p95_ranged = np.percentile(point, 95), np.percentile(ranged, 95)
+    return {
+        'single_p50_ms': round(statistics.median(point), 4),
+        'single_range_p50_ms': round(statistics.median(ranged), 4),
+        'single_p95_ms': round(float(p95_point), 4),
+        'single_range_p95_ms': round(float(p95_ranged), 4),
+        'added_p95_ms': round(float(p95_ranged - p95_point), 4),
+        'batch_rows': len(batch),
+        'batch_rows_per_second': round(len(batch) / batch_point),
+        'batch_range_rows_per_second': round(len(batch) / batch_ranged),
+        'batch_overhead_pct': round((batch_ranged / batch_point - 1) * 100, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the cost of prediction intervals")
+    parser.add_argument('--rows', type=int, default=20000, help="training rows")
+    parser.add_argument('--requests', type=int, default=500, help="single predictions timed")
+    parser.add_argument('--batch', type=int, default=100000, help="rows in the batch test")
+    parser.add_argument('--budget-ms', type=float, default=5.0, help="allowed added p95 latency per request")
+    parser.add_argument('--json', action='store_true', help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    model, label_encoder = train_price_model(generate_market_data(args.rows, seed=1))
+    requests = generate_market_data(args.requests, seed=2)
+    batch = generate_market_data(args.batch, seed=3)
+    result = bench_intervals(model, label_encoder, requests, batch)
+
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(f"single request p50: {result['single_p50_ms']:.3f} ms -> {result['single_range_p50_ms']:.3f} ms with range")
+        print(f"single request p95: {result['single_p95_ms']:.3f} ms -> {result['single_range_p95_ms']:.3f} ms with range")
+        print(f"batch of {result['batch_rows']:,}: {result['batch_rows_per_second']:,} -> "
+              f"{result['batch_range_rows_per_second']:,} rows/s ({result['batch_overhead_pct']:+.1f}%)")
+
+    if result['added_p95_ms'] > args.budget_ms:
+        print(f"FAIL added p95 latency {result['added_p95_ms']:.3f} ms exceeds budget {args.budget_ms:.3f} ms")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Per-worker memory of the pre-fork prediction service.
+
+Usage:
+    python benchmarks/bench_prefork.py [--rows 200000] [--workers 1 2 4] [--json]
+
+Trains a model on ``--rows`` generated rows into a temporary artifact store,
+then starts prediction_service.py with each worker count, drives load through
+every worker and reads /proc/<pid>/smaps_rollup. ``private`` is what one
+worker costs on its own; with the model shared it should stay small and flat
+as workers are added, while a single process holds everything privately.
+Linux only.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from load_test import run_load_test  # noqa: E402
+from worker_pool import memory_usage  # noqa: E402
+
+BUILD_SNIPPET = """
+from market_data import generate_market_data
+from model_registry import ModelRegistry, load_serving_model
+from model_store import ModelStore
+load_serving_model(ModelRegistry(store=ModelStore({artifact_dir!r})),
+                   loader=lambda: generate_market_data({rows}), source='synthetic')
+"""
+
+
+def _children(pid):
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def _wait_healthy(port, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=1) as response:
+                return json.load(response)
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"service on port {port} did not become healthy")
+
+
+def bench_workers(workers, artifact_dir, port, requests):
+    # The service must pick up the generated benchmark model, not LISTINGS_DIR
+    env = dict(os.environ, PYTHONPATH=ROOT, MODEL_ARTIFACT_DIR=artifact_dir, LISTINGS_DIR='')
+    process = subprocess.Popen(
+        [sys.executable, 'prediction_service.py', '--port', str(port), '--workers', str(workers),
+         '--host', '127.0.0.1'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_healthy(port)
+        load = asyncio.run(run_load_test('127.0.0.1', port, concurrency=8 * workers, total_requests=requests))
+        pids = _children(process.pid) if workers > 1 else [process.pid]
+        usages = [u for u in (memory_usage(pid) for pid in pids) if u is not None]
+        parent = memory_usage(process.pid)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    mb = 1024 * 1024
+    return {
+        'workers': workers,
+        'throughput_rps': load['throughput_rps'],
+        'worker_rss_mb': round(sum(u['rss'] for u in usages) / len(usages) / mb, 1),
+        'worker_private_mb': round(sum(u['private'] for u in usages) / len(usages) / mb, 1),
+        'worker_pss_mb': round(sum(u['pss'] for u in usages) / len(usages) / mb, 1),
+        'total_pss_mb': round((sum(u['pss'] for u in usages) + (parent['pss'] if workers > 1 else 0)) / mb, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure per-worker memory of the pre-fork service")
+    parser.add_argument('--rows', type=int, default=200000, help="training rows (model size)")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--json', action='store_true', help="print one JSON object per worker count")
+    args = parser.parse_args(argv)
+
+    if memory_usage() is None:
+        print("needs /proc/<pid>/smaps_rollup (Linux)")
+        return 1
+
+    with tempfile.TemporaryDirectory() as artifact_dir:
+        subprocess.run([sys.executable, '-c', BUILD_SNIPPET.format(artifact_dir=artifact_dir, rows=args.rows)],
+                       cwd=ROOT, env=dict(os.environ, PYTHONPATH=ROOT), check=True, capture_output=True)
+        results = [bench_workers(n, artifact_dir, args.port, args.requests) for n in args.workers]
+
+    if args.json:
+        for result in results:
+            print(json.dumps(result))
+        return 0
+
+    header = f"{'workers':>8}{'req/s':>10}{'RSS MB':>10}{'private MB':>12}{'PSS MB':>10}{'total PSS MB':>14}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['workers']:>8}{r['throughput_rps']:>10,.0f}{r['worker_rss_mb']:>10.1f}"
+              f"{r['worker_private_mb']:>12.1f}{r['worker_pss_mb']:>10.1f}{r['total_pss_mb']:>14.1f}")
+    print("(RSS, private and PSS are per worker)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Server-side time per Streamlit rerun.
+
+Usage:
+    python benchmarks/bench_reruns.py [--repeat 10] [--json]
+
+Drives app.py through Streamlit's AppTest, gets an estimate once and then
+times the reruns triggered by ordinary interactions: picking a room in the
+virtual tour, typing a visitor name, getting another estimate and a bare
+rerun. The model is trained before timing starts, so the numbers are the
+cost of re-executing the script, not of loading data.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+ROOMS = ["Living Room", "Master Bedroom", "Kitchen", "Bathroom", "Balcony", "Common Areas"]
+
+
+def _widget(widgets, label):
+    return next(w for w in widgets if w.label == label)
+
+
+def _timed(run):
+    start = time.perf_counter()
+    at = run()
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return at, elapsed
+
+
+def bench_reruns(repeat=10):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=600).run()
+    at, _ = _timed(lambda: at.button[0].click().run())
+
+    timings = {'tour_room': [], 'visitor_name': [], 'estimate': [], 'rerun': []}
+    for i in range(repeat):
+        at, elapsed = _timed(lambda: _widget(at.selectbox, "Choose a room to explore:").select(ROOMS[i % len(ROOMS)]).run())
+        timings['tour_room'].append(elapsed)
+        at, elapsed = _timed(lambda: _widget(at.text_input, "Your Name").input(f"Visitor {i}").run())
+        timings['visitor_name'].append(elapsed)
+        at, elapsed = _timed(lambda: at.button[0].click().run())
+        timings['estimate'].append(elapsed)
+        at, elapsed = _timed(lambda: at.run())
+        timings['rerun'].append(elapsed)
+
+    return {
+        f'{name}_ms': round(statistics.median(values) * 1000, 2)
+        for name, values in timings.items()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure server-side Streamlit rerun time")
+    parser.add_argument('--repeat', type=int, default=10, help="interactions timed per kind")
+    parser.add_argument('--json', action='store_true', help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as artifact_dir:
+        os.environ.setdefault('MODEL_ARTIFACT_DIR', artifact_dir)
+        result = bench_reruns(args.repeat)
+
+    if args.json:
+        print(json.dumps(result))
+        return 0
+    print("median server-side time per rerun:")
+    for name, value in result.items():
+        print(f"  {name[:-3]:<14}{value:>9.2f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
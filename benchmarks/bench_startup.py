@@ -0,0 +1,157 @@
+"""
+Startup profiling and startup-cost regression check.
+
+Usage:
+    python benchmarks/bench_startup.py                 # profile report
+    python benchmarks/bench_startup.py --app           # also time the Streamlit script
+    python benchmarks/bench_startup.py --check         # fail if over startup_budget.json
+    python benchmarks/bench_startup.py --update-budget # record current numbers (+50% headroom)
+
+Every measurement runs in a fresh interpreter so nothing is already imported.
+Reports import time per module (python -X importtime) and time to first
+estimate, cold (training) and warm (artifact on disk).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'startup_budget.json')
+
+# What app.py imports at module load, besides Streamlit itself
+APP_MODULES = ['instrumentation', 'model_registry', 'background_training', 'prediction_cache', 'market_index',
+               'comparables', 'price_surface', 'market_charts', 'builders', 'property_features', 'price_model',
+               'market_data']
+
+FIRST_ESTIMATE_SNIPPET = """
+import json, time, warnings
+start = time.perf_counter()
+from model_registry import ModelRegistry, load_serving_model
+from model_store import ModelStore
+from price_model import predict_price
+imported = time.perf_counter()
+registry = ModelRegistry(store=ModelStore({artifact_dir!r}))
+_, model, label_encoder = load_serving_model(registry)
+loaded = time.perf_counter()
+warnings.simplefilter('ignore')
+predict_price(model, label_encoder, 1500, 3, 2, 'Pune')
+done = time.perf_counter()
+print(json.dumps({{'import_s': imported - start, 'model_s': loaded - imported,
+                  'predict_s': done - loaded, 'first_estimate_s': done - start}}))
+"""
+
+APP_SNIPPET = """
+import json, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file('app.py', default_timeout=600).run()
+rendered = time.perf_counter()
+at.button[0].click().run()
+done = time.perf_counter()
+print(json.dumps({'app_first_run_s': rendered - start, 'app_first_estimate_s': done - start}))
+"""
+
+
+def _run(code, env=None, args=()):
+    env = dict(os.environ, PYTHONPATH=ROOT, **(env or {}))
+    result = subprocess.run([sys.executable, *args, '-c', code], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return result
+
+
+def import_times(modules):
+    """
+    Return ``(total_seconds, [(module, cumulative_seconds), ...])`` for importing
+    ``modules`` in a fresh interpreter, slowest first
+    """
+    result = _run(f"import {', '.join(modules)}", args=('-X', 'importtime'))
+    rows, top_level = [], 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        seconds = int(cumulative) / 1e6
+        rows.append((name.strip(), seconds))
+        if not name.startswith('  '):
+            top_level += seconds
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return top_level, rows
+
+
+def first_estimate(artifact_dir):
+    return json.loads(_run(FIRST_ESTIMATE_SNIPPET.format(artifact_dir=artifact_dir)).stdout.splitlines()[-1])
+
+
+def profile(include_app=False, top=15):
+    results = {}
+    total, rows = import_times(APP_MODULES)
+    results['app_imports_s'] = total
+    results['streamlit_import_s'] = import_times(['streamlit'])[0]
+    print(f"import of app modules: {total:.3f}s (streamlit alone {results['streamlit_import_s']:.3f}s)")
+    print(f"slowest modules (cumulative):")
+    for name, seconds in rows[:top]:
+        print(f"  {seconds * 1000:9.1f} ms  {name}")
+
+    with tempfile.TemporaryDirectory() as artifact_dir:
+        cold = first_estimate(artifact_dir)
+        warm = first_estimate(artifact_dir)
+    results['cold_first_estimate_s'] = cold['first_estimate_s']
+    results['warm_first_estimate_s'] = warm['first_estimate_s']
+    for label, timing in (('cold', cold), ('warm', warm)):
+        print(f"time to first estimate ({label}): {timing['first_estimate_s']:.3f}s "
+              f"(imports {timing['import_s']:.3f}s, model {timing['model_s']:.3f}s, "
+              f"predict {timing['predict_s'] * 1000:.1f}ms)")
+
+    if include_app:
+        with tempfile.TemporaryDirectory() as artifact_dir:
+            app = json.loads(_run(APP_SNIPPET, env={'MODEL_ARTIFACT_DIR': artifact_dir}).stdout.splitlines()[-1])
+        results.update(app)
+        print(f"streamlit script: first run {app['app_first_run_s']:.3f}s, "
+              f"first estimate {app['app_first_estimate_s']:.3f}s")
+    return results
+
+
+def check(results, budget, tolerance):
+    failures = []
+    for metric, limit in budget.items():
+        if metric in results and results[metric] > limit * (1 + tolerance):
+            failures.append(f"{metric}: {results[metric]:.3f}s exceeds budget {limit:.3f}s")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile startup and guard against regressions")
+    parser.add_argument('--app', action='store_true', help="also run app.py through Streamlit's AppTest")
+    parser.add_argument('--check', action='store_true', help="exit 1 if any metric exceeds the budget")
+    parser.add_argument('--tolerance', type=float, default=0.0, help="extra slack on top of the budget")
+    parser.add_argument('--update-budget', action='store_true', help="write current numbers +50%% to the budget file")
+    parser.add_argument('--json', action='store_true', help="print the measurements as JSON")
+    args = parser.parse_args(argv)
+
+    results = profile(include_app=args.app)
+    if args.json:
+        print(json.dumps(results))
+
+    if args.update_budget:
+        with open(BUDGET_FILE, 'w') as f:
+            json.dump({k: round(v * 1.5, 3) for k, v in sorted(results.items())}, f, indent=2)
+            f.write('\n')
+        print(f"budget written to {BUDGET_FILE}")
+
+    if args.check:
+        with open(BUDGET_FILE) as f:
+            budget = json.load(f)
+        failures = check(results, budget, args.tolerance)
+        for failure in failures:
+            print(f"FAIL {failure}")
+        if failures:
+            return 1
+        print("startup within budget")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""
+End-to-end benchmark and load-simulation suite, no browser needed.
+
+Usage:
+    python benchmarks/bench_suite.py                           # 500 .. 5M rows, 8 sessions
+    python benchmarks/bench_suite.py --rows 500 50000 --sessions 4 --quick
+    python benchmarks/bench_suite.py --compare benchmarks/results/<earlier>.json
+
+For each dataset size it times data generation, compaction, training, single
+and batch prediction and the insight structures (market index, comparables,
+chart figures). It then simulates concurrent sessions by running app.py
+through Streamlit's AppTest in parallel worker processes (AppTest swaps in a
+process-global mock runtime, so sessions cannot share a process), all using
+the same artifact store like the workers of a multi-process deployment.
+Results, with the git commit and library versions, are written as JSON to
+benchmarks/results/ so runs can be compared over time.
+
+Training a full-depth forest on millions of rows needs tens of GB, so sizes
+above ``--max-train-rows`` train on that many rows (recorded as
+``train_rows``) and the remaining timings use that model.
+"""
+import argparse
+import concurrent.futures
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import time
+from importlib.metadata import version
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from columnar import MarketColumns, bytes_per_row  # noqa: E402
+from comparables import ComparablesIndex  # noqa: E402
+from market_charts import build_market_figures  # noqa: E402
+from market_data import generate_market_data  # noqa: E402
+from market_index import MarketIndex  # noqa: E402
+from model_registry import dataset_fingerprint  # noqa: E402
+from price_model import MODEL_PARAMS, predict_price_range, predict_prices, train_price_model  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+DEFAULT_ROWS = [500, 50000, 500000, 5000000]
+
+# Lower is better for every metric except these
+HIGHER_IS_BETTER = ('rows_per_second', 'sessions_per_second')
+
+
+def _timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def _percentiles_ms(seconds):
+    p50, p95 = np.percentile(np.array(seconds) * 1000, [50, 95])
+    return round(float(p50), 3), round(float(p95), 3)
+
+
+def bench_size(n_rows, max_train_rows, single_calls, batch_rows, queries):
+    result = {'rows': n_rows}
+    data, elapsed = _timed(lambda: generate_market_data(n_rows, seed=0))
+    result['generate_seconds'] = round(elapsed, 4)
+
+    columns, elapsed = _timed(lambda: MarketColumns.from_frame(data))
+    result['compact_seconds'] = round(elapsed, 4)
+    result['bytes_per_row'] = round(float(bytes_per_row(columns.frame())), 2)
+    _, elapsed = _timed(lambda: dataset_fingerprint(data))
+    result['fingerprint_seconds'] = round(elapsed, 4)
+
+    train = data if n_rows <= max_train_rows else data.iloc[:max_train_rows]
+    (model, label_encoder), elapsed = _timed(lambda: train_price_model(train, **MODEL_PARAMS))
+    result['train_rows'] = len(train)
+    result['train_seconds'] = round(elapsed, 4)
+
+    rng = np.random.default_rng(1)
+    sample = data.iloc[rng.integers(0, n_rows, size=max(single_calls, queries))]
+    rows = list(sample.itertuples(index=False))
+    singles = []
+    for row in rows[:single_calls]:
+        _, elapsed = _timed(lambda: predict_price_range(model, label_encoder, row.area, row.bedrooms,
+                                                        row.bathrooms, row.location))
+        singles.append(elapsed)
+    result['single_p50_ms'], result['single_p95_ms'] = _percentiles_ms(singles)
+
+    batch = data.iloc[:min(batch_rows, n_rows)]
+    _, elapsed = _timed(lambda: predict_prices(model, label_encoder, batch))
+    result['batch_rows'] = len(batch)
+    result['batch_rows_per_second'] = round(len(batch) / elapsed)
+
+    market_index, elapsed = _timed(lambda: MarketIndex.build(data))
+    result['market_index_seconds'] = round(elapsed, 4)
+    _, elapsed = _timed(lambda: build_market_figures(market_index))
+    result['chart_figures_seconds'] = round(elapsed, 4)
+    comparables, elapsed = _timed(lambda: ComparablesIndex.build(data))
+    result['comparables_build_seconds'] = round(elapsed, 4)
+    lookups = []
+    for row in rows[:queries]:
+        _, elapsed = _timed(lambda: comparables.summary(str(row.location), row.area, row.bedrooms, row.bathrooms))
+        lookups.append(elapsed)
+    result['comparables_p50_ms'], result['comparables_p95_ms'] = _percentiles_ms(lookups)
+    return result
+
+
+def _session(index):
+    from streamlit.testing.v1 import AppTest
+
+    # AppTest runs the script as __main__; keep this module there so the
+    # pool can still find _session for the worker's next task
+    main_module = sys.modules['__main__']
+    try:
+        start = time.perf_counter()
+        at = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=600).run()
+        first_run = time.perf_counter() - start
+        at.number_input[0].set_value(1000 + 50 * index).run()
+        next(b for b in at.button if 'Price Estimate' in b.label).click().run()
+        rerun_start = time.perf_counter()
+        at.run()
+        rerun = time.perf_counter() - rerun_start
+    finally:
+        sys.modules['__main__'] = main_module
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return first_run, time.perf_counter() - start, rerun
+
+
+def bench_sessions(n_sessions, rounds=2):
+    """
+    ``n_sessions`` AppTest sessions at once, one per worker process; the
+    first round starts each worker cold (imports, model load or training),
+    later rounds are warm
+    """
+    results = []
+    context = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(max_workers=n_sessions, mp_context=context) as pool:
+        for round_number in range(rounds):
+            start = time.perf_counter()
+            timings = list(pool.map(_session, range(n_sessions)))
+            elapsed = time.perf_counter() - start
+            first_runs, totals, reruns = zip(*timings)
+            first_p50, first_p95 = _percentiles_ms(first_runs)
+            total_p50, total_p95 = _percentiles_ms(totals)
+            rerun_p50, rerun_p95 = _percentiles_ms(reruns)
+            results.append({
+                'round': round_number,
+                'sessions': n_sessions,
+                'seconds': round(elapsed, 3),
+                'sessions_per_second': round(n_sessions / elapsed, 2),
+                'first_run_p50_ms': first_p50, 'first_run_p95_ms': first_p95,
+                'session_p50_ms': total_p50, 'session_p95_ms': total_p95,
+                'rerun_p50_ms': rerun_p50, 'rerun_p95_ms': rerun_p95,
+            })
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'packages': {name: version(name) for name in ('numpy', 'pandas', 'scikit-learn', 'streamlit', 'plotly')},
+        'model_params': dict(MODEL_PARAMS),
+    }
+
+
+def compare(current, previous):
+    """
+    Percent change per metric between two result files, matched by size or round
+    """
+    lines = []
+    for section, key in (('sizes', 'rows'), ('sessions', 'round')):
+        before = {entry[key]: entry for entry in previous.get(section, [])}
+        for entry in current.get(section, []):
+            old = before.get(entry[key])
+            if old is None:
+                continue
+            for metric, value in entry.items():
+                if metric == key or not isinstance(value, (int, float)) or not old.get(metric):
+                    continue
+                change = (value - old[metric]) / old[metric] * 100
+                worse = change < 0 if metric.endswith(HIGHER_IS_BETTER) else change > 0
+                flag = '  <-- slower' if worse and abs(change) > 20 else ''
+                lines.append(f"{section}[{key}={entry[key]}] {metric}: {old[metric]} -> {value} ({change:+.1f}%){flag}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end estimator benchmarks and session simulation")
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS, help="dataset sizes")
+    parser.add_argument('--max-train-rows', type=int, default=200000, help="largest training set")
+    parser.add_argument('--single-calls', type=int, default=200)
+    parser.add_argument('--batch-rows', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=200, help="comparables lookups timed")
+    parser.add_argument('--sessions', type=int, default=8, help="concurrent AppTest sessions (0 to skip)")
+    parser.add_argument('--rounds', type=int, default=2, help="rounds of concurrent sessions")
+    parser.add_argument('--quick', action='store_true', help="fewer timed calls, for smoke runs")
+    parser.add_argument('--output', help="result file (default benchmarks/results/bench-<time>.json)")
+    parser.add_argument('--compare', help="earlier result file to diff against")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.single_calls, args.queries, args.batch_rows = 20, 20, 10000
+
+    report = {'environment': environment(), 'sizes': [], 'sessions': []}
+    for n_rows in args.rows:
+        result = bench_size(n_rows, args.max_train_rows, args.single_calls, args.batch_rows, args.queries)
+        report['sizes'].append(result)
+        print(json.dumps(result), flush=True)
+
+    if args.sessions:
+        for result in bench_sessions(args.sessions, args.rounds):
+            report['sessions'].append(result)
+            print(json.dumps(result), flush=True)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = report['environment']['timestamp'].replace(':', '').replace('-', '')[:15]
+        output = os.path.join(RESULTS_DIR, f"bench-{stamp}.json")
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+    print(f"results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        for line in compare(report, previous):
+            print(line)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import bisect
+import functools
+import json
+import os
+import sys
+from collections import namedtuple
+
+BUILDERS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'builders.json')
+
+# One builder's presence in one city; builder-level fields are shared
+Listing = namedtuple('Listing', ['city', 'builder_id', 'rating', 'specialty', 'projects'])
+
+
+class BuilderCatalog:
+    """
+    Read-only, deduplicated builders catalog with lookup indexes.
+
+    Builder names and experience are stored once and referenced by id from
+    per-city listings; repeated strings (specialties, cities) are interned.
+    City, builder-name and specialty indexes map to listing ids, and each city
+    keeps its listings sorted by rating so ``min_rating`` is a bisect.
+    Cities without their own listings use the default builders.
+    """
+
+    DEFAULT_CITY = '*'
+
+    def __init__(self, raw):
+        self.builder_names = tuple(b['name'] for b in raw['builders'])
+        self.builder_experience = tuple(b['experience'] for b in raw['builders'])
+        builder_ids = {name: i for i, name in enumerate(self.builder_names)}
+
+        listings = []
+        by_city, by_name, by_specialty = {}, {}, {}
+        cities = list(raw['cities'].items()) + [(self.DEFAULT_CITY, raw['default'])]
+        for city, entries in cities:
+            city = sys.intern(city)
+            for entry in entries:
+                listing_id = len(listings)
+                builder_id = builder_ids[entry['builder']]
+                specialty = sys.intern(entry['specialty'])
+                listings.append(Listing(city, builder_id, float(entry['rating']),
+                                        specialty, tuple(entry['projects'])))
+                by_city.setdefault(city, []).append(listing_id)
+                by_name.setdefault(builder_id, []).append(listing_id)
+                by_specialty.setdefault(specialty.lower(), []).append(listing_id)
+
+        self.listings = tuple(listings)
+        self.by_city = {city: tuple(ids) for city, ids in by_city.items()}
+        self.by_name = {self.builder_names[b]: tuple(ids) for b, ids in by_name.items()}
+        self.by_specialty = {s: frozenset(ids) for s, ids in by_specialty.items()}
+
+        # Per city: listing ids ordered by ascending rating, plus the ratings for bisect
+        self._by_rating = {}
+        for city, ids in self.by_city.items():
+            ordered = sorted(ids, key=lambda i: self.listings[i].rating)
+            self._by_rating[city] = (tuple(ordered), [self.listings[i].rating for i in ordered])
+
+        # Materialized dicts in the shape the app renders, built once per city
+        self._city_records = {city: tuple(self.record(i) for i in ids) for city, ids in self.by_city.items()}
+
+    @classmethod
+    def from_file(cls, path=BUILDERS_FILE):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _city_key(self, city):
+        return city if city in self.by_city else self.DEFAULT_CITY
+
+    def record(self, listing_id):
+        """
+        Listing as the dict shape used by the UI
+        """
+        listing = self.listings[listing_id]
+        return {
+            'name': self.builder_names[listing.builder_id],
+            'projects': list(listing.projects),
+            'rating': listing.rating,
+            'experience': self.builder_experience[listing.builder_id],
+            'specialty': listing.specialty,
+        }
+
+    def for_city(self, city):
+        """
+        Builders for a city (or the default builders), in catalog order.
+
+        The returned records are shared and must be treated as read-only.
+        """
+        return self._city_records[self._city_key(city)]
+
+    def by_builder(self, name):
+        """
+        Every city listing for a builder name, e.g. all Godrej Properties projects
+        """
+        return [self.record(i) for i in self.by_name.get(name, ())]
+
+    def find(self, city, min_rating=None, specialty=None):
+        """
+        Builders in a city filtered by minimum rating and/or specialty, best rated first
+        """
+        ids, ratings = self._by_rating[self._city_key(city)]
+        if min_rating is not None:
+            ids = ids[bisect.bisect_left(ratings, min_rating):]
+        if specialty is not None:
+            matching = self.by_specialty.get(specialty.lower(), frozenset())
+            ids = [i for i in ids if i in matching]
+        return [self.record(i) for i in reversed(ids)]
+
+
+@functools.lru_cache(maxsize=1)
+def get_builder_catalog():
+    """
+    The catalog, loaded from disk once per process
+    """
+    return BuilderCatalog.from_file()
@@ -0,0 +1,157 @@
+"""
+Compact, read-only columnar representation of market data.
+
+Usage:
+    python columnar.py --rows 1000000     # bytes per row before and after
+"""
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from market_data import MARKET_COLUMNS
+
+COLUMN_DTYPES = {
+    'area': np.int32,
+    'bedrooms': np.int8,
+    'bathrooms': np.float32,
+}
+LOCATION_CODE_DTYPE = np.int16
+
+
+def _read_only(array):
+    array = np.ascontiguousarray(array)
+    if array.flags.writeable:
+        array.setflags(write=False)
+    return array
+
+
+class MarketColumns:
+    """
+    Market data as one read-only NumPy array per column.
+
+    Locations are int16 codes into a category list, area/bedrooms/bathrooms
+    use int32/int8/float32 and price is int32 whenever every value fits.
+    ``frame()`` wraps the arrays in a DataFrame without copying them, so the
+    training, insight and chart code share the same memory. Arrays can be
+    saved as ``.npy`` files and memory-mapped back by other processes.
+    """
+
+    def __init__(self, area, bedrooms, bathrooms, location_codes, categories, price):
+        self.area = _read_only(area)
+        self.bedrooms = _read_only(bedrooms)
+        self.bathrooms = _read_only(bathrooms)
+        self.location_codes = _read_only(location_codes)
+        self.categories = list(categories)
+        self.price = _read_only(price)
+        self._frame = None
+
+    @classmethod
+    def from_frame(cls, data):
+        location = data['location']
+        if isinstance(location.dtype, pd.CategoricalDtype):
+            codes, categories = location.cat.codes.to_numpy(), location.cat.categories
+        else:
+            codes, categories = pd.factorize(location, sort=True)
+        price = pd.to_numeric(data['price'].to_numpy(), downcast='integer')
+        if price.dtype.itemsize < 4:
+            price = price.astype(np.int32)
+        return cls(
+            area=data['area'].to_numpy().astype(COLUMN_DTYPES['area'], copy=False),
+            bedrooms=data['bedrooms'].to_numpy().astype(COLUMN_DTYPES['bedrooms'], copy=False),
+            bathrooms=data['bathrooms'].to_numpy().astype(COLUMN_DTYPES['bathrooms'], copy=False),
+            location_codes=codes.astype(LOCATION_CODE_DTYPE, copy=False),
+            categories=[str(c) for c in categories],
+            price=price,
+        )
+
+    def __len__(self):
+        return len(self.price)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.area, self.bedrooms, self.bathrooms, self.location_codes, self.price))
+
+    def frame(self):
+        """
+        Zero-copy DataFrame view in the market data schema (built once)
+        """
+        if self._frame is None:
+            location = pd.Categorical.from_codes(self.location_codes, categories=self.categories)
+            self._frame = pd.DataFrame({
+                'area': self.area,
+                'bedrooms': self.bedrooms,
+                'bathrooms': self.bathrooms,
+                'location': location,
+                'price': self.price,
+            }, columns=MARKET_COLUMNS, copy=False)
+        return self._frame
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name in ('area', 'bedrooms', 'bathrooms', 'location_codes', 'price'):
+            np.save(os.path.join(directory, f'{name}.npy'), getattr(self, name))
+        with open(os.path.join(directory, 'categories.json'), 'w') as f:
+            json.dump(self.categories, f)
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """
+        Load saved columns; with ``mmap_mode='r'`` pages are shared between
+        every process that maps the same files
+        """
+        def column(name):
+            return np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode)
+
+        with open(os.path.join(directory, 'categories.json')) as f:
+            categories = json.load(f)
+        return cls(column('area'), column('bedrooms'), column('bathrooms'),
+                   column('location_codes'), categories, column('price'))
+
+
+def compact_market_frame(data):
+    """
+    Compact, read-only DataFrame for any market data frame
+    """
+    return MarketColumns.from_frame(data).frame()
+
+
+def bytes_per_row(data):
+    return data.memory_usage(deep=True, index=False).sum() / max(len(data), 1)
+
+
+def memory_report(data):
+    """
+    Bytes per row of a market DataFrame before and after compaction
+    """
+    compact = compact_market_frame(data)
+    return {
+        'rows': len(data),
+        'before_bytes_per_row': round(float(bytes_per_row(data)), 2),
+        'after_bytes_per_row': round(float(bytes_per_row(compact)), 2),
+        'before_dtypes': {c: str(t) for c, t in data.dtypes.items()},
+        'after_dtypes': {c: str(t) for c, t in compact.dtypes.items()},
+    }
+
+
+def main(argv=None):
+    from market_data import generate_market_data
+
+    parser = argparse.ArgumentParser(description="Memory per row of market data before and after compaction")
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args(argv)
+
+    # The original object-dtype layout: Python strings and int64/float64 columns
+    data = generate_market_data(args.rows, seed=0)
+    data = data.astype({'area': np.int64, 'bedrooms': np.int64, 'bathrooms': np.float64,
+                        'location': object, 'price': np.int64})
+    report = memory_report(data)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Nearest-neighbour comparables ("similar homes") per city.
+
+Rows are sorted by city and then area once per dataset. A query binary
+searches the city's area column and scores a window of rows around the
+target on scaled area, bedroom and bathroom differences. The window grows
+until no row outside it could be closer than the current k-th best, which
+the area gap alone bounds. A query touches a few dozen rows at any dataset
+size. benchmarks/bench_comparables.py compares it with the old mask filter.
+"""
+import numpy as np
+import pandas as pd
+
+from instrumentation import counted, timed
+
+# One unit of distance: 250 sq ft (about one bedroom's worth of area in the
+# market data), one bedroom or one bathroom
+AREA_SCALE = 250.0
+
+DEFAULT_K = 20
+
+
+class ComparablesIndex:
+    """
+    Market rows sorted by (city, area) with per-city offsets
+    """
+
+    def __init__(self, categories, offsets, area, bedrooms, bathrooms, price, row_index):
+        self.categories = {str(c): i for i, c in enumerate(categories)}
+        self.offsets = offsets
+        self.area = area
+        self.bedrooms = bedrooms
+        self.bathrooms = bathrooms
+        self.price = price
+        self.row_index = row_index
+
+    @classmethod
+    @timed('comparables_build')
+    def build(cls, data):
+        location = data['location']
+        if isinstance(location.dtype, pd.CategoricalDtype):
+            codes, categories = location.cat.codes.to_numpy(), location.cat.categories
+        else:
+            codes, categories = pd.factorize(location, sort=True)
+        area = data['area'].to_numpy()
+        order = np.lexsort((area, codes))
+        offsets = np.searchsorted(codes[order], np.arange(len(categories) + 1))
+        # Columns keep their compact dtypes; _distances casts each window to float64
+        return cls(
+            categories,
+            offsets,
+            area[order],
+            data['bedrooms'].to_numpy()[order],
+            data['bathrooms'].to_numpy()[order],
+            data['price'].to_numpy()[order],
+            order.astype(np.int32 if len(order) < 2 ** 31 else np.int64),
+        )
+
+    def _distances(self, start, stop, area, bedrooms, bathrooms):
+        # Cast before subtracting: int8 bedroom gaps of 12 or more overflow when squared
+        return (
+            ((self.area[start:stop] - float(area)) / AREA_SCALE) ** 2
+            + (self.bedrooms[start:stop].astype(np.float64) - bedrooms) ** 2
+            + (self.bathrooms[start:stop].astype(np.float64) - bathrooms) ** 2
+        )
+
+    @timed('comparables_nearest')
+    @counted('comparables_queries')
+    def nearest(self, location, area, bedrooms, bathrooms, k=DEFAULT_K):
+        """
+        Return ``(positions, distances)`` of the ``k`` closest homes in the
+        same city, nearest first; positions index the sorted arrays (see
+        ``rows()`` for the original row numbers). Empty for an unknown city.
+        """
+        code = self.categories.get(str(location))
+        if code is None:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        first, last = int(self.offsets[code]), int(self.offsets[code + 1])
+        k = min(k, last - first)
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        centre = first + int(np.searchsorted(self.area[first:last], area))
+        half_width = 2 * k
+        while True:
+            start, stop = max(first, centre - half_width), min(last, centre + half_width)
+            distances = self._distances(start, stop, area, bedrooms, bathrooms)
+            if len(distances) > k:
+                candidates = np.argpartition(distances, k - 1)[:k]
+            else:
+                candidates = np.arange(len(distances))
+            kth = distances[candidates].max()
+
+            # Rows beyond the window are at least this far away on area alone
+            left_gap = area - self.area[start - 1] if start > first else np.inf
+            right_gap = self.area[stop] - area if stop < last else np.inf
+            bound = (min(left_gap, right_gap) / AREA_SCALE) ** 2
+            if bound >= kth or (start == first and stop == last):
+                break
+            half_width *= 4
+
+        order = candidates[np.argsort(distances[candidates], kind='stable')]
+        return start + order, distances[order]
+
+    def rows(self, positions):
+        """
+        Original row numbers in the market data for positions from nearest()
+        """
+        return self.row_index[positions]
+
+    def summary(self, location, area, bedrooms, bathrooms, k=DEFAULT_K):
+        """
+        Price statistics of the ``k`` comparables, or None for an unknown city:
+        ``count``, ``median_price`` and price per sq ft ``p25``, ``median``,
+        ``p75`` and ``mean``
+        """
+        positions, _ = self.nearest(location, area, bedrooms, bathrooms, k)
+        if len(positions) == 0:
+            return None
+        prices = self.price[positions].astype(np.float64)
+        per_sqft = prices / self.area[positions]
+        p25, median, p75 = np.percentile(per_sqft, [25, 50, 75])
+        return {
+            'count': len(positions),
+            'median_price': float(np.median(prices)),
+            'price_per_sqft': {'p25': float(p25), 'median': float(median), 'p75': float(p75),
+                               'mean': float(per_sqft.mean())},
+        }
@@ -0,0 +1,253 @@
+"""
+Streaming ingestion of local listing files into the market data schema.
+
+Listing dumps (for example realtor.com or Zillow research exports, or the
+sample files in fixtures/listings) are read chunk by chunk from CSV, JSONL or
+Parquet, validated and normalized to ``area, bedrooms, bathrooms, location,
+price`` with a categorical location and downcast numeric columns. Only the
+compact normalized chunks are kept, never the whole raw file.
+
+load_market_data() is what the app, the background trainer and the headless
+tools (batch_predict.py, prediction_service.py, price_surface.py) train on:
+the listings in LISTINGS_DIR when it is set, generated data otherwise.
+
+Usage:
+    python ingest.py fixtures/listings
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import timed
+from market_data import DEFAULT_SEED, LOCATIONS, MARKET_COLUMNS, generate_market_data
+
+SUPPORTED_EXTENSIONS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet', '.pq': 'parquet'}
+
+# Common header spellings in listing dumps, mapped to the schema
+COLUMN_ALIASES = {
+    'sqft': 'area', 'square_feet': 'area', 'area_sqft': 'area', 'carpet_area': 'area', 'size': 'area',
+    'beds': 'bedrooms', 'bedroom': 'bedrooms', 'bhk': 'bedrooms',
+    'baths': 'bathrooms', 'bathroom': 'bathrooms',
+    'city': 'location', 'locality': 'location',
+    'list_price': 'price', 'sale_price': 'price', 'price_inr': 'price',
+}
+
+# Market data generated when LISTINGS_DIR is not set
+SYNTHETIC_ROWS = 500
+
+# Inclusive ranges outside of which a row is rejected
+VALID_RANGES = {
+    'area': (100, 100000),
+    'bedrooms': (1, 20),
+    'bathrooms': (0.5, 20),
+    'price': (10000, 10 ** 11),
+}
+
+
+def file_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        return SUPPORTED_EXTENSIONS[extension]
+    except KeyError:
+        raise ValueError(f"Unsupported file type '{extension}', expected one of: {', '.join(SUPPORTED_EXTENSIONS)}")
+
+
+def require_pyarrow():
+    """
+    Import pyarrow (with pyarrow.parquet) for Parquet input and output, or
+    raise ImportError saying how to install it
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise ImportError("Parquet files need pyarrow; install it with 'pip install pyarrow' "
+                          "or use CSV/JSONL") from None
+    return pyarrow
+
+
+def iter_chunks(path, chunk_size=100000, columns=None):
+    """
+    Stream a CSV, JSONL or Parquet file as DataFrames of at most ``chunk_size`` rows
+    """
+    kind = file_format(path)
+    if kind == 'csv':
+        yield from pd.read_csv(path, chunksize=chunk_size)
+    elif kind == 'jsonl':
+        yield from pd.read_json(path, lines=True, chunksize=chunk_size)
+    else:
+        pq = require_pyarrow().parquet
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+
+
+def listing_files(source):
+    """
+    A single file, or every supported file in a directory in name order
+    """
+    if os.path.isfile(source):
+        return [source]
+    return [
+        os.path.join(source, name) for name in sorted(os.listdir(source))
+        if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS
+    ]
+
+
+class IngestReport:
+    """
+    Row counts for an ingestion run, with rejected rows broken down by reason
+    """
+
+    def __init__(self):
+        self.files = 0
+        self.rows_read = 0
+        self.rows_kept = 0
+        self.rejected = {}
+
+    def reject(self, reason, count):
+        if count:
+            self.rejected[reason] = self.rejected.get(reason, 0) + int(count)
+
+    def as_dict(self):
+        return {'files': self.files, 'rows_read': self.rows_read, 'rows_kept': self.rows_kept,
+                'rejected': dict(self.rejected)}
+
+
+def normalize_chunk(chunk, report=None, locations=LOCATIONS):
+    """
+    Validate a raw chunk and return it in the market data schema.
+
+    Headers are matched case-insensitively and through COLUMN_ALIASES. When
+    several headers map to the same column (dumps often have both ``city``
+    and ``locality``), the exact schema name wins, then the alias listed
+    first in COLUMN_ALIASES; the others are dropped. Rows with missing or
+    non-numeric values, values outside VALID_RANGES or a city outside
+    ``locations`` are dropped and counted in ``report``.
+    """
+    report = report if report is not None else IngestReport()
+    alias_rank = {alias: rank for rank, alias in enumerate(COLUMN_ALIASES)}
+    chosen = {}
+    for column in chunk.columns:
+        key = str(column).strip().lower().replace(' ', '_')
+        target = COLUMN_ALIASES.get(key, key)
+        rank = -1 if key == target else alias_rank[key]
+        if target not in chosen or rank < chosen[target][0]:
+            chosen[target] = (rank, column)
+    chunk = chunk[[column for _, column in chosen.values()]]
+    chunk.columns = list(chosen)
+    missing = [c for c in MARKET_COLUMNS if c not in chunk.columns]
+    if missing:
+        raise ValueError(f"Listings are missing required columns: {', '.join(missing)}")
+
+    report.rows_read += len(chunk)
+    keep = np.ones(len(chunk), dtype=bool)
+    numeric = {}
+    for column, (low, high) in VALID_RANGES.items():
+        values = pd.to_numeric(chunk[column], errors='coerce').to_numpy(dtype=float)
+        invalid = np.isnan(values)
+        report.reject(f'{column}_missing', (invalid & keep).sum())
+        keep &= ~invalid
+        out_of_range = (values < low) | (values > high)
+        report.reject(f'{column}_out_of_range', (out_of_range & keep).sum())
+        keep &= ~out_of_range
+        numeric[column] = values
+
+    city = chunk['location'].astype('string').str.strip().str.title()
+    location = pd.Categorical(city, categories=locations)
+    unknown = location.codes < 0
+    report.reject('unknown_location', (unknown & keep).sum())
+    keep &= ~unknown
+
+    normalized = pd.DataFrame({
+        'area': pd.to_numeric(np.round(numeric['area'][keep]), downcast='integer'),
+        'bedrooms': pd.to_numeric(np.round(numeric['bedrooms'][keep]), downcast='integer'),
+        'bathrooms': (np.round(numeric['bathrooms'][keep] * 2) / 2).astype(np.float32),
+        'location': location[keep],
+        'price': pd.to_numeric(np.round(numeric['price'][keep]), downcast='integer'),
+    }, columns=MARKET_COLUMNS)
+    report.rows_kept += len(normalized)
+    return normalized
+
+
+def iter_listings(source, chunk_size=100000, report=None, locations=LOCATIONS):
+    """
+    Yield normalized chunks from a listing file or directory
+    """
+    report = report if report is not None else IngestReport()
+    for path in listing_files(source):
+        report.files += 1
+        for chunk in iter_chunks(path, chunk_size):
+            normalized = normalize_chunk(chunk, report, locations)
+            if len(normalized):
+                yield normalized
+
+
+@timed('load_listings')
+def load_listings(source, chunk_size=100000, locations=LOCATIONS):
+    """
+    Ingest every listing under ``source`` into one compact DataFrame.
+
+    Returns ``(data, report)``. Peak memory is the normalized result plus one
+    raw chunk.
+    """
+    report = IngestReport()
+    chunks = list(iter_listings(source, chunk_size, report, locations))
+    if not chunks:
+        return pd.DataFrame({c: pd.Series(dtype=object) for c in MARKET_COLUMNS}), report
+    # Categories are identical across chunks, so concat keeps the categorical dtype
+    data = pd.concat(chunks, ignore_index=True)
+    for column in ('area', 'bedrooms', 'price'):
+        data[column] = pd.to_numeric(data[column], downcast='integer')
+    return data, report
+
+
+def market_source():
+    """
+    Name of the configured data source: the listings directory, or for
+    generated data ``synthetic:seed=<seed>:rows=<rows>``. Stored datasets are
+    only reused for the same source, so changing MARKET_DATA_SEED regenerates.
+    """
+    return os.environ.get('LISTINGS_DIR') or f'synthetic:seed={DEFAULT_SEED}:rows={SYNTHETIC_ROWS}'
+
+
+def load_market_data():
+    """
+    Market data to train on: listing dumps from LISTINGS_DIR when set,
+    otherwise generated from MARKET_DATA_SEED
+    """
+    listings_dir = os.environ.get('LISTINGS_DIR')
+    if listings_dir:
+        data, report = load_listings(listings_dir)
+        if len(data) == 0:
+            raise ValueError(f"no valid listings found in {listings_dir} ({report.as_dict()})")
+        return data
+    return generate_market_data(n_rows=SYNTHETIC_ROWS, seed=DEFAULT_SEED)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate and normalize local listing files")
+    parser.add_argument('source', help="listing file or directory of CSV/JSONL/Parquet files")
+    parser.add_argument('--chunk-size', type=int, default=100000)
+    parser.add_argument('--output', help="write the normalized listings to this Parquet file")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.output:
+            require_pyarrow()
+        data, report = load_listings(args.source, chunk_size=args.chunk_size)
+    except ImportError as e:
+        print(e)
+        return 1
+    print(report.as_dict())
+    print(data.dtypes.to_dict())
+    print(f"{data.memory_usage(deep=True).sum() / max(len(data), 1):.1f} bytes per row")
+    if args.output:
+        data.to_parquet(args.output, index=False)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
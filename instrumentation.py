@@ -0,0 +1,256 @@
+"""
+Lightweight timing and counter instrumentation for the hot paths.
+
+Disabled unless PRICE_METRICS=1 (or ``enable()`` is called). While disabled,
+the decorators and ``timer()`` cost one attribute check per call.
+
+Environment:
+    PRICE_METRICS=1             collect timings and counters
+    PRICE_METRICS_FILE=path     append a JSON-lines snapshot after each request
+    PRICE_PROFILE_RATE=0.01     cProfile this fraction of requests
+    PRICE_PROFILE_DIR=profiles  where sampled .prof files are written
+
+Metrics are exported in the Prometheus text format (``prometheus_text()``,
+served at GET /metrics by prediction_service.py) or as JSON lines.
+"""
+import bisect
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import random
+import threading
+import time
+
+METRIC_PREFIX = 'housepricepro'
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _env_flag(name):
+    return os.environ.get(name, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class _Timing:
+    """
+    Call count, error count, total and max seconds plus bucketed latencies
+    """
+
+    __slots__ = ('count', 'errors', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, seconds, failed):
+        self.count += 1
+        self.errors += failed
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def as_dict(self):
+        return {'count': self.count, 'errors': self.errors, 'total_seconds': round(self.total, 6),
+                'max_seconds': round(self.max, 6)}
+
+
+class Metrics:
+    """
+    Thread-safe registry of named timings and counters for one process
+    """
+
+    def __init__(self, enabled=False, jsonl_path=None, profile_rate=0.0, profile_dir='profiles'):
+        self.enabled = enabled
+        self.jsonl_path = jsonl_path
+        self.profile_rate = profile_rate
+        self.profile_dir = profile_dir
+        self._timings = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds, failed=False):
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                timing = self._timings[name] = _Timing()
+            timing.observe(seconds, failed)
+
+    def count(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self._timings.clear()
+            self._counters.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'timestamp': time.time(),
+                'timings': {name: t.as_dict() for name, t in sorted(self._timings.items())},
+                'counters': dict(sorted(self._counters.items())),
+            }
+
+    def prometheus_text(self):
+        """
+        All metrics in the Prometheus text exposition format
+        """
+        seconds, events, errors = (f'{METRIC_PREFIX}_{n}' for n in ('duration_seconds', 'events_total', 'errors_total'))
+        lines = []
+        with self._lock:
+            timings = sorted(self._timings.items())
+            counters = sorted(self._counters.items())
+        if timings:
+            lines.append(f'# HELP {seconds} Time spent in instrumented functions and blocks.')
+            lines.append(f'# TYPE {seconds} histogram')
+            for name, t in timings:
+                cumulative = 0
+                for bound, bucket in zip(LATENCY_BUCKETS, t.buckets):
+                    cumulative += bucket
+                    lines.append(f'{seconds}_bucket{{name="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{seconds}_bucket{{name="{name}",le="+Inf"}} {t.count}')
+                lines.append(f'{seconds}_sum{{name="{name}"}} {t.total:.6f}')
+                lines.append(f'{seconds}_count{{name="{name}"}} {t.count}')
+            lines.append(f'# HELP {errors} Instrumented calls that raised.')
+            lines.append(f'# TYPE {errors} counter')
+            for name, t in timings:
+                lines.append(f'{errors}{{name="{name}"}} {t.errors}')
+        if counters:
+            lines.append(f'# HELP {events} Instrumented event counts.')
+            lines.append(f'# TYPE {events} counter')
+            for name, value in counters:
+                lines.append(f'{events}{{name="{name}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def export_jsonl(self, path=None, **fields):
+        """
+        Append one JSON line with the current snapshot (plus ``fields``) to ``path``
+        """
+        path = path or self.jsonl_path
+        if not path:
+            return
+        line = json.dumps(dict(self.snapshot(), **fields))
+        with self._lock, open(path, 'a') as f:
+            f.write(line + '\n')
+
+
+_metrics = Metrics(
+    enabled=_env_flag('PRICE_METRICS'),
+    jsonl_path=os.environ.get('PRICE_METRICS_FILE') or None,
+    profile_rate=float(os.environ.get('PRICE_PROFILE_RATE', 0) or 0),
+    profile_dir=os.environ.get('PRICE_PROFILE_DIR', 'profiles'),
+)
+
+
+def get_metrics():
+    return _metrics
+
+
+def enable(enabled=True):
+    _metrics.enabled = enabled
+
+
+def timed(name):
+    """
+    Decorator recording the wall time and failures of every call as ``name``
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _metrics.enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = function(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                _metrics.observe(name, time.perf_counter() - start, failed)
+        return wrapper
+    return decorator
+
+
+def counted(name):
+    """
+    Decorator counting calls as ``name``
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _metrics.enabled:
+                _metrics.count(name)
+            return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, amount=1):
+    _metrics.count(name, amount)
+
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+@contextlib.contextmanager
+def _timer(name):
+    start = time.perf_counter()
+    failed = True
+    try:
+        yield
+        failed = False
+    finally:
+        _metrics.observe(name, time.perf_counter() - start, failed)
+
+
+def timer(name):
+    """
+    Context manager timing a block of code as ``name``
+    """
+    return _timer(name) if _metrics.enabled else _NULL_CONTEXT
+
+
+@contextlib.contextmanager
+def _profiled_request(name):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        os.makedirs(_metrics.profile_dir, exist_ok=True)
+        path = os.path.join(_metrics.profile_dir, f'{name}-{time.time_ns()}-{threading.get_ident()}.prof')
+        profiler.dump_stats(path)
+        _metrics.count('profiled_requests')
+
+
+@contextlib.contextmanager
+def _request(name):
+    sampled = _metrics.profile_rate > 0 and random.random() < _metrics.profile_rate
+    try:
+        with timer(name), (_profiled_request(name) if sampled else _NULL_CONTEXT):
+            yield
+    finally:
+        _metrics.export_jsonl(request=name)
+
+
+def request(name):
+    """
+    Context manager around one request (a Streamlit run or an API call).
+
+    Times it, profiles it with cProfile for a PRICE_PROFILE_RATE sample of
+    requests (``python -m pstats <file>`` to inspect) and appends a metrics
+    snapshot to PRICE_METRICS_FILE afterwards.
+    """
+    if not _metrics.enabled:
+        return _NULL_CONTEXT
+    return _request(name)
@@ -0,0 +1,116 @@
+"""
+Local load-test harness for prediction_service.py.
+
+Usage:
+    python prediction_service.py --port 8000 &
+    python load_test.py --port 8000 --concurrency 64 --requests 20000
+
+Each virtual client keeps one HTTP/1.1 connection open and sends single
+property requests back to back. Reports latency percentiles and throughput.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+import numpy as np
+
+from market_data import BATHROOM_OPTIONS, BEDROOM_OPTIONS, LOCATIONS
+
+
+def random_property(rng):
+    return {
+        'area': rng.randrange(200, 10001, 50),
+        'bedrooms': rng.choice(BEDROOM_OPTIONS),
+        'bathrooms': rng.choice(BATHROOM_OPTIONS),
+        'location': rng.choice(LOCATIONS),
+    }
+
+
+async def _client(host, port, n_requests, latencies, errors, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(n_requests):
+            body = json.dumps(random_property(rng)).encode()
+            request = (
+                f"POST /predict HTTP/1.1\r\nHost: {host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+            ).encode() + body
+
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode().partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if b' 200 ' not in status_line:
+                errors.append(status_line.decode().strip())
+    finally:
+        writer.close()
+
+
+async def run_load_test(host, port, concurrency, total_requests):
+    """
+    Return a summary dict with latency percentiles (ms) and throughput
+    """
+    latencies, errors = [], []
+    per_client = [total_requests // concurrency] * concurrency
+    for i in range(total_requests % concurrency):
+        per_client[i] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, n, latencies, errors, seed)
+        for seed, n in enumerate(per_client) if n
+    ))
+    elapsed = time.perf_counter() - start
+
+    latency_ms = np.array(latencies) * 1000
+    p50, p95, p99 = np.percentile(latency_ms, [50, 95, 99])
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(float(p50), 3),
+        'p95_ms': round(float(p95), 3),
+        'p99_ms': round(float(p99), 3),
+        'max_ms': round(float(latency_ms.max()), 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the JSON prediction service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--json', action='store_true', help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    summary = asyncio.run(run_load_test(args.host, args.port, args.concurrency, args.requests))
+    if args.json:
+        print(json.dumps(summary))
+    else:
+        print(f"{summary['requests']:,} requests, {summary['errors']} errors, "
+              f"concurrency {summary['concurrency']}, {summary['seconds']}s")
+        print(f"throughput: {summary['throughput_rps']:,} req/s")
+        print(f"latency ms: p50 {summary['p50_ms']}  p95 {summary['p95_ms']}  "
+              f"p99 {summary['p99_ms']}  max {summary['max_ms']}")
+    return 1 if summary['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
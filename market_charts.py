@@ -0,0 +1,59 @@
+"""
+Market trend figures built from the precomputed MarketIndex aggregates.
+
+Figures only contain per-location averages and histogram bins, so their
+serialized size does not grow with the number of listings.
+"""
+import json
+
+import numpy as np
+
+from instrumentation import timer
+
+
+def build_market_figures(market_index):
+    """
+    Return the ``(price by location, price distribution)`` Plotly figures
+    """
+    # Plotly is only needed here, so it is imported on first use
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    with timer('figure_price_by_location'):
+        # Price by location
+        avg_by_location = market_index.average_by_location()
+        fig1 = px.bar(
+            avg_by_location,
+            x='location',
+            y='price',
+            title="Average Price by Location",
+            labels={'price': 'Average Price ($)', 'location': 'Location'}
+        )
+        fig1.update_layout(xaxis_tickangle=45)
+
+    with timer('figure_price_distribution'):
+        # Price distribution from pre-binned counts
+        counts, edges = market_index.price_histogram()
+        fig2 = go.Figure(go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=np.diff(edges),
+            hovertemplate="Price: %{x:,.0f}<br>Number of Properties: %{y}<extra></extra>"
+        ))
+        fig2.update_layout(
+            title="Market Price Distribution",
+            xaxis_title="Price ($)",
+            yaxis_title="Number of Properties",
+            bargap=0
+        )
+
+    return fig1, fig2
+
+
+def figure_json(figure):
+    """
+    Serialize a figure as st.plotly_chart does, to measure the payload
+    """
+    import plotly.utils
+    return json.dumps(figure, cls=plotly.utils.PlotlyJSONEncoder)
+
@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import timed
+
+# Seed for generated market data and synthesized property details; runs are
+# reproducible unless MARKET_DATA_SEED is changed
+DEFAULT_SEED = int(os.environ.get('MARKET_DATA_SEED', 42))
+
+# Cities covered by the estimator
+LOCATIONS = ['Mumbai', 'Delhi', 'Bangalore', 'Chennai', 'Hyderabad', 'Pune', 'Kolkata', 'Ahmedabad', 'Jaipur', 'Surat', 'Lucknow', 'Kanpur', 'Nagpur', 'Indore', 'Thane', 'Bhopal', 'Visakhapatnam', 'Pimpri-Chinchwad', 'Patna', 'Vadodara', 'Ghaziabad', 'Ludhiana', 'Agra', 'Nashik', 'Faridabad', 'Meerut', 'Rajkot', 'Kalyan-Dombivali', 'Vasai-Virar', 'Varanasi']
+
+# Market-based pricing with Indian city factors (based on real estate market trends)
+LOCATION_FACTORS = {
+    'Mumbai': 2.5, 'Delhi': 2.2, 'Bangalore': 2.0, 'Chennai': 1.5, 'Hyderabad': 1.4,
+    'Pune': 1.6, 'Kolkata': 1.3, 'Ahmedabad': 1.2, 'Jaipur': 1.1, 'Surat': 1.0,
+    'Lucknow': 0.9, 'Kanpur': 0.8, 'Nagpur': 0.9, 'Indore': 0.9, 'Thane': 2.0,
+    'Bhopal': 0.8, 'Visakhapatnam': 0.9, 'Pimpri-Chinchwad': 1.5, 'Patna': 0.7,
+    'Vadodara': 1.0, 'Ghaziabad': 1.4, 'Ludhiana': 0.9, 'Agra': 0.7, 'Nashik': 1.0,
+    'Faridabad': 1.3, 'Meerut': 0.8, 'Rajkot': 0.9, 'Kalyan-Dombivali': 1.8,
+    'Vasai-Virar': 1.6, 'Varanasi': 0.7
+}
+
+BEDROOM_OPTIONS = [1, 2, 3, 4, 5]
+BEDROOM_PROBS = [0.1, 0.2, 0.4, 0.25, 0.05]
+BATHROOM_OPTIONS = [1, 1.5, 2, 2.5, 3, 3.5, 4]
+BATHROOM_PROBS = [0.15, 0.1, 0.3, 0.2, 0.15, 0.05, 0.05]
+
+MARKET_COLUMNS = ['area', 'bedrooms', 'bathrooms', 'location', 'price']
+
+
+@timed('generate_market_data')
+def generate_market_data(n_rows=500, seed=DEFAULT_SEED):
+    """
+    Generate synthetic Indian housing market data in one vectorized pass.
+
+    Draws every column as a NumPy array from a ``numpy.random.Generator`` and
+    follows the same distributions as the original row-by-row generator, so it
+    scales to millions of rows for capacity testing and retraining. ``seed``
+    may be an int or a Generator; the same seed always gives the same data.
+    """
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+    location_codes = rng.integers(0, len(LOCATIONS), size=n_rows)
+    bedrooms = rng.choice(np.array(BEDROOM_OPTIONS), size=n_rows, p=BEDROOM_PROBS)
+    bathrooms = rng.choice(np.array(BATHROOM_OPTIONS, dtype=float), size=n_rows, p=BATHROOM_PROBS)
+
+    # Area based on bedrooms with realistic sizing
+    base_area = 400 + bedrooms * 250 + rng.normal(0, 150, size=n_rows)
+    area = np.maximum(300, np.trunc(base_area))
+
+    # Current Indian market pricing (2024 rates in INR)
+    base_price = (
+        area * 4500 +  # Current market rate per sqft in INR
+        bedrooms * 400000 +  # Bedroom premium in INR
+        bathrooms * 300000 +  # Bathroom premium in INR
+        rng.normal(1200000, 500000, size=n_rows)  # Market variation in INR
+    )
+    factors = np.array([LOCATION_FACTORS[city] for city in LOCATIONS])
+    price = np.trunc(base_price * factors[location_codes])
+    price = np.maximum(80000, price).astype(np.int32)  # Minimum realistic price
+
+    # Compact column types (see columnar.py): cities are categorical codes
+    return pd.DataFrame({
+        'area': area.astype(np.int32),
+        'bedrooms': bedrooms.astype(np.int8),
+        'bathrooms': bathrooms.astype(np.float32),
+        'location': pd.Categorical.from_codes(location_codes.astype(np.int16), categories=LOCATIONS),
+        'price': price
+    }, columns=MARKET_COLUMNS)
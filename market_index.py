@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from instrumentation import timed
+
+HISTOGRAM_BINS = 30
+
+
+class MarketIndex:
+    """
+    Aggregates of a market dataset computed once so insights and charts are
+    dictionary lookups instead of scans over every row.
+
+    Holds count, sum and mean price per location, plus price histograms
+    (overall and per location) on shared bin edges. Similar homes are found
+    by comparables.ComparablesIndex.
+    """
+
+    def __init__(self, location_stats, bin_edges, histogram, location_histograms):
+        self.location_stats = location_stats
+        self.bin_edges = bin_edges
+        self.histogram = histogram
+        self.location_histograms = location_histograms
+
+    @classmethod
+    @timed('market_index_build')
+    def build(cls, data, n_bins=HISTOGRAM_BINS):
+        prices = data['price'].to_numpy()
+
+        by_location = data.groupby('location', observed=True)['price'].agg(['count', 'sum'])
+        location_stats = pd.DataFrame({
+            'location': by_location.index.astype(str),
+            'count': by_location['count'].to_numpy(),
+            'sum': by_location['sum'].to_numpy(dtype=float),
+        })
+        location_stats['price'] = location_stats['sum'] / location_stats['count']
+        location_stats = location_stats.sort_values('location', ignore_index=True)
+
+        histogram, bin_edges = np.histogram(prices, bins=n_bins)
+        bin_index = np.clip(np.searchsorted(bin_edges, prices, side='right') - 1, 0, n_bins - 1)
+        codes, locations = pd.factorize(data['location'], sort=True)
+        per_location = np.bincount(codes * n_bins + bin_index, minlength=len(locations) * n_bins)
+        location_histograms = {
+            str(location): per_location[i * n_bins:(i + 1) * n_bins]
+            for i, location in enumerate(locations)
+        }
+
+        return cls(location_stats, bin_edges, histogram, location_histograms)
+
+    def average_by_location(self):
+        """
+        DataFrame of location, count and mean price, ready for the bar chart
+        """
+        return self.location_stats
+
+    def price_histogram(self, location=None):
+        """
+        Return ``(counts, bin_edges)`` for all homes or a single location
+        """
+        if location is None:
+            return self.histogram, self.bin_edges
+        counts = self.location_histograms.get(location)
+        if counts is None:
+            counts = np.zeros(len(self.bin_edges) - 1, dtype=np.int64)
+        return counts, self.bin_edges
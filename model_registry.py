@@ -0,0 +1,343 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from columnar import MarketColumns
+from ingest import load_market_data, market_source
+from model_store import DEFAULT_ARTIFACT_DIR, ModelStore, artifact_name
+from price_model import MODEL_PARAMS, train_price_model
+from training import refresh_model
+
+logger = logging.getLogger(__name__)
+
+
+def dataset_fingerprint(data):
+    """
+    Stable content hash of a market dataset, used to key trained models
+    """
+    row_hashes = pd.util.hash_pandas_object(data, index=False).values
+    digest = hashlib.sha1(row_hashes.tobytes())
+    digest.update(",".join(map(str, data.columns)).encode())
+    return digest.hexdigest()[:16]
+
+
+def model_key(fingerprint, params):
+    """
+    Registry key for a dataset fingerprint and a set of hyperparameters
+    """
+    return (fingerprint, tuple(sorted(params.items())))
+
+
+class ModelRegistry:
+    """
+    Process-wide store of trained models shared by every Streamlit session.
+
+    Models are keyed by dataset fingerprint plus hyperparameters, trained at
+    most once per key and kept in LRU order up to ``max_versions`` entries.
+    With a ``store`` the dataset and models are warm started from disk and
+    freshly trained models are persisted for the next process.
+    """
+
+    def __init__(self, max_versions=2, store=None):
+        self.max_versions = max_versions
+        self.store = store
+        self._models = OrderedDict()
+        self._key_locks = {}
+        self._lock = threading.RLock()
+        self._market_data = None
+        self._market_fingerprint = None
+        self._market_source = 'synthetic'
+        self.market_columns = None
+        self._derived = {}
+        self.stats = {'hits': 0, 'trains': 0, 'loads': 0, 'refreshes': 0, 'evictions': 0}
+        self.last_refresh_report = None
+
+    def get_market_data(self, loader, source='synthetic'):
+        """
+        Return the shared market dataset, loading it once per process.
+
+        ``source`` names where the data comes from (generated, or a listings
+        directory); a stored dataset is only reused for the same source.
+        """
+        with self._lock:
+            self._market_source = source
+            if self._market_data is None and self.store is not None:
+                stored = self.store.load_latest_dataset(source)
+                if stored is not None:
+                    self._set_market_data(*stored)
+            if self._market_data is None:
+                data = loader()
+                if data is None:
+                    return None, None
+                self._set_market_data(data)
+            return self._market_data, self._market_fingerprint
+
+    def current_market_data(self):
+        """
+        Return ``(data, fingerprint)`` currently served, without loading anything
+        """
+        with self._lock:
+            return self._market_data, self._market_fingerprint
+
+    def warm_start(self, source='synthetic', **params):
+        """
+        Serve the latest stored dataset and its model right away, even if the
+        artifact is older than the store's max_age (a background retrain can
+        replace it). Returns True if the artifact is fresh, False if it is past
+        max_age and None if nothing usable is stored.
+        """
+        if self.store is None:
+            return None
+        with self._lock:
+            self._market_source = source
+            stored = self.store.load_latest_dataset(source, check_age=False)
+            if stored is None:
+                return None
+            data, fingerprint = stored
+            key = model_key(fingerprint, params)
+            loaded = self.store.load_model(key, check_age=False)
+            if loaded is None:
+                return None
+            self._insert(key, *loaded)
+            self.stats['loads'] += 1
+            self._set_market_data(data, fingerprint)
+            return self.store.is_compatible(self.store.read_meta(self.store.latest_name()))
+
+    def publish(self, data, trainer, source='synthetic', **params):
+        """
+        Train (or load) a model for ``data`` and then make data and model
+        current together.
+
+        Training happens before anything is swapped, so sessions keep serving
+        the previous version meanwhile. If the stored artifact for this data is
+        past max_age the model is refitted and re-saved even when it is cached.
+        Returns ``(key, trained)``; ``trained`` is False when an existing model
+        was reused.
+        """
+        columns = MarketColumns.from_frame(data)
+        data = columns.frame()
+        fingerprint = dataset_fingerprint(data)
+        with self._lock:
+            self._market_source = source
+        refit = self._artifact_stale(model_key(fingerprint, params))
+        key, model, _, trained = self._get_or_train(data, trainer, fingerprint, refit, params)
+        if model is None:
+            raise RuntimeError("Training returned no model")
+        # The model is registered first, so the new fingerprint always has one
+        with self._lock:
+            self.market_columns = columns
+            self._market_data = data
+            self._market_fingerprint = fingerprint
+            self._derived = {k: v for k, v in self._derived.items() if k[1] == fingerprint}
+        return key, trained
+
+    def _artifact_stale(self, key):
+        """
+        Whether a stored artifact exists for ``key`` but may no longer be reused
+        """
+        if self.store is None:
+            return False
+        meta = self.store.read_meta(artifact_name(key))
+        return meta is not None and not self.store.is_compatible(meta, key)
+
+    def _set_market_data(self, data, fingerprint=None):
+        # One compact, read-only columnar copy is shared by every consumer
+        self.market_columns = MarketColumns.from_frame(data)
+        self._market_data = self.market_columns.frame()
+        self._market_fingerprint = fingerprint or dataset_fingerprint(self._market_data)
+
+    def get_derived(self, name, build):
+        """
+        Return a structure derived from the shared market dataset (indexes,
+        aggregates), calling ``build(data)`` once per dataset version.
+
+        Like model training, the build runs under a per-key lock rather than
+        the registry lock, so other sessions are not blocked while it runs.
+        """
+        with self._lock:
+            if self._market_data is None:
+                return None
+            data, key = self._market_data, (name, self._market_fingerprint)
+            if key in self._derived:
+                return self._derived[key]
+
+        lock_key = ('derived',) + key
+        with self._key_lock(lock_key):
+            # Another session may have finished building while we waited
+            with self._lock:
+                if key in self._derived:
+                    return self._derived[key]
+            value = build(data)
+            with self._lock:
+                # The dataset may have been replaced while building; only cache for the current one
+                if key[1] == self._market_fingerprint:
+                    # Drop anything built for a previous dataset version
+                    self._derived = {k: v for k, v in self._derived.items() if k[1] == key[1]}
+                    self._derived[key] = value
+                self._key_locks.pop(lock_key, None)
+            return value
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, key):
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+                self.stats['hits'] += 1
+            return entry
+
+    def get_or_train(self, data, trainer, fingerprint=None, **params):
+        """
+        Return ``(key, model, label_encoder)``, training only on a cache miss.
+
+        Concurrent sessions asking for the same key wait on a per-key lock so
+        the model is fitted exactly once.
+        """
+        if fingerprint is None:
+            fingerprint = dataset_fingerprint(data)
+        return self._get_or_train(data, trainer, fingerprint, False, params)[:3]
+
+    def _get_or_train(self, data, trainer, fingerprint, refit, params):
+        # Returns (key, model, label_encoder, trained); refit skips both caches
+        key = model_key(fingerprint, params)
+
+        entry = None if refit else self.get(key)
+        if entry is not None:
+            return (key,) + entry + (False,)
+
+        with self._key_lock(key):
+            # Another session may have finished training while we waited
+            entry = None if refit else self.get(key)
+            if entry is not None:
+                return (key,) + entry + (False,)
+
+            stored = self.store.load_model(key) if self.store is not None and not refit else None
+            if stored is not None:
+                model, label_encoder = stored
+                self.stats['loads'] += 1
+            else:
+                model, label_encoder = trainer(data, **params)
+                if model is None:
+                    return key, None, None, False
+                self.stats['trains'] += 1
+                self._persist(key, model, label_encoder, data)
+
+            self._insert(key, model, label_encoder)
+            return key, model, label_encoder, stored is None
+
+    def _insert(self, key, model, label_encoder):
+        with self._lock:
+            self._models[key] = (model, label_encoder)
+            self._models.move_to_end(key)
+            while len(self._models) > self.max_versions:
+                evicted, _ = self._models.popitem(last=False)
+                self._key_locks.pop(evicted, None)
+                self.stats['evictions'] += 1
+
+    def append_market_data(self, new_rows, extra_trees=25, **params):
+        """
+        Add newly arrived market rows and refresh the current model by growing
+        ``extra_trees`` trees on the combined data instead of refitting from
+        scratch.
+
+        The combined dataset becomes the shared market data and the refreshed
+        model is registered under its fingerprint; sessions pick it up on their
+        next rerun. Returns ``(key, model, label_encoder)``.
+        """
+        params = params or MODEL_PARAMS
+        with self._lock:
+            data, fingerprint = self._market_data, self._market_fingerprint
+        if data is None:
+            raise RuntimeError("No market data loaded to append to")
+        entry = self.get(model_key(fingerprint, params))
+        if entry is None:
+            raise RuntimeError("No trained model for the current market data to refresh")
+
+        columns = MarketColumns.from_frame(pd.concat([data, new_rows[data.columns]], ignore_index=True))
+        combined = columns.frame()
+        # The extra trees see every row, not just the new ones (see refresh_model)
+        model, report = refresh_model(entry[0], entry[1], combined, extra_trees=extra_trees)
+        new_fingerprint = dataset_fingerprint(combined)
+        key = model_key(new_fingerprint, params)
+
+        # Register the model before publishing the data so no session sees the
+        # new fingerprint without a model and starts a full retrain
+        self._insert(key, model, entry[1])
+        with self._lock:
+            self.market_columns = columns
+            self._market_data = combined
+            self._market_fingerprint = new_fingerprint
+            self._derived = {k: v for k, v in self._derived.items() if k[1] == new_fingerprint}
+            self.stats['refreshes'] += 1
+            self.last_refresh_report = report
+        self._persist(key, model, entry[1], combined)
+        return key, model, entry[1]
+
+    def _persist(self, key, model, label_encoder, data):
+        if self.store is None:
+            return
+        try:
+            self.store.save(key, model, label_encoder, data, {'source': self._market_source})
+        except OSError as e:
+            # A read-only or full disk must not take serving down
+            logger.warning("Could not persist model artifact: %s", e)
+
+    def invalidate(self, fingerprint=None):
+        """
+        Drop cached models for one dataset fingerprint, or everything if omitted.
+
+        Invalidating everything also forgets the shared market dataset so the
+        next session reloads it.
+        """
+        with self._lock:
+            if fingerprint is None:
+                self._models.clear()
+                self._key_locks.clear()
+                self._derived.clear()
+                self.market_columns = None
+                self._market_data = None
+                self._market_fingerprint = None
+                return
+            for key in [k for k in self._models if k[0] == fingerprint]:
+                del self._models[key]
+                self._key_locks.pop(key, None)
+            self._derived = {k: v for k, v in self._derived.items() if k[1] != fingerprint}
+            if fingerprint == self._market_fingerprint:
+                self.market_columns = None
+                self._market_data = None
+                self._market_fingerprint = None
+
+    def versions(self):
+        with self._lock:
+            return list(self._models.keys())
+
+
+# Module-level singleton: Streamlit re-executes app.py on every rerun, but
+# imported modules live for the whole server process.
+_registry = ModelRegistry(store=ModelStore() if DEFAULT_ARTIFACT_DIR else None)
+
+
+def get_registry():
+    return _registry
+
+
+def load_serving_model(registry=None, loader=None, source=None, **params):
+    """
+    Return ``(key, model, label_encoder)`` for headless callers.
+
+    Uses the same data source as the app (LISTINGS_DIR or generated data, see
+    ingest.load_market_data), so it warm starts from the app's artifacts when
+    possible and otherwise loads market data with ``loader`` and trains with
+    the default hyperparameters.
+    """
+    registry = registry or get_registry()
+    data, fingerprint = registry.get_market_data(loader or load_market_data, source or market_source())
+    if data is None:
+        raise RuntimeError("No market data available to train the price model")
+    return registry.get_or_train(data, train_price_model, fingerprint=fingerprint, **(params or MODEL_PARAMS))
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from importlib.metadata import version
+
+import numpy as np
+
+from columnar import MarketColumns
+
+# Bump when the on-disk layout changes so old artifacts are treated as stale
+FORMAT_VERSION = 3
+
+# Read from package metadata: importing scikit-learn itself costs ~0.6s
+SKLEARN_VERSION = version('scikit-learn')
+
+DEFAULT_ARTIFACT_DIR = os.environ.get('MODEL_ARTIFACT_DIR', 'artifacts')
+DEFAULT_MAX_AGE = 24 * 3600
+
+
+def artifact_name(key):
+    """
+    Directory name for a registry key of (fingerprint, params)
+    """
+    fingerprint, params = key
+    params_hash = hashlib.sha1(repr(params).encode()).hexdigest()[:8]
+    return f"{fingerprint}-{params_hash}"
+
+
+class ModelStore:
+    """
+    Local-disk store of fitted models, encoder classes and training data.
+
+    Each artifact is a directory holding ``model.joblib``, the training data
+    as columnar ``.npy`` files under ``market/`` (memory-mapped read-only on
+    load with ``mmap``) and ``meta.json``. Only the market columns are
+    mapped; the model is read into memory, since scikit-learn copies tree
+    nodes out of any mapping when unpickling. A ``LATEST`` pointer names the
+    most recent artifact so a fresh process can warm start without retraining.
+    """
+
+    def __init__(self, root=DEFAULT_ARTIFACT_DIR, max_age=DEFAULT_MAX_AGE, mmap=True):
+        self.root = root
+        self.max_age = max_age
+        self.mmap_mode = 'r' if mmap else None
+
+    def _path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def artifact_path(self, key, *parts):
+        """
+        Path of an artifact directory (or a file in it) for a registry key
+        """
+        return self._path(artifact_name(key), *parts)
+
+    def save(self, key, model, label_encoder, data, metadata=None):
+        """
+        Write an artifact atomically and mark it as the latest one
+        """
+        import joblib
+
+        os.makedirs(self.root, exist_ok=True)
+        name = artifact_name(key)
+        tmp_dir = tempfile.mkdtemp(prefix=f".{name}-", dir=self.root)
+        try:
+            joblib.dump(model, os.path.join(tmp_dir, 'model.joblib'))
+
+            MarketColumns.from_frame(data).save(os.path.join(tmp_dir, 'market'))
+
+            fingerprint, params = key
+            meta = {
+                'format': FORMAT_VERSION,
+                'fingerprint': fingerprint,
+                'params': dict(params),
+                'classes': [str(c) for c in label_encoder.classes_],
+                'columns': list(data.columns),
+                'n_rows': int(len(data)),
+                'sklearn_version': SKLEARN_VERSION,
+                'numpy_version': np.__version__,
+                'created_at': time.time(),
+            }
+            meta.update(metadata or {})
+            with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+                json.dump(meta, f, indent=2)
+
+            final_dir = self._path(name)
+            if os.path.isdir(final_dir):
+                shutil.rmtree(final_dir)
+            os.replace(tmp_dir, final_dir)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        pointer_tmp = self._path(f".LATEST.{os.getpid()}")
+        with open(pointer_tmp, 'w') as f:
+            f.write(name)
+        os.replace(pointer_tmp, self._path('LATEST'))
+        return final_dir
+
+    def read_meta(self, name):
+        try:
+            with open(self._path(name, 'meta.json')) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_compatible(self, meta, key=None, check_age=True):
+        """
+        Whether an artifact can be reused: same layout, library version,
+        hyperparameters (and fingerprint when given) and, with ``check_age``,
+        not older than max_age
+        """
+        if meta is None or meta.get('format') != FORMAT_VERSION:
+            return False
+        if meta.get('sklearn_version') != SKLEARN_VERSION:
+            return False
+        if check_age and self.max_age is not None and time.time() - meta.get('created_at', 0) > self.max_age:
+            return False
+        if key is not None:
+            fingerprint, params = key
+            if meta.get('fingerprint') != fingerprint or meta.get('params') != dict(params):
+                return False
+        return True
+
+    def latest_name(self):
+        try:
+            with open(self._path('LATEST')) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def load_model(self, key, check_age=True):
+        """
+        Return ``(model, label_encoder)`` for a key, or None if missing or
+        stale (past max_age only counts with ``check_age``)
+        """
+        import joblib
+        from sklearn.preprocessing import LabelEncoder
+
+        name = artifact_name(key)
+        meta = self.read_meta(name)
+        if not self.is_compatible(meta, key, check_age):
+            return None
+        model = joblib.load(self._path(name, 'model.joblib'))
+        label_encoder = LabelEncoder()
+        label_encoder.classes_ = np.array(meta['classes'], dtype=object)
+        return model, label_encoder
+
+    def load_latest_dataset(self, source=None, check_age=True):
+        """
+        Return ``(data, fingerprint)`` of the latest compatible artifact, or None.
+
+        With ``source``, only a dataset recorded from the same source is returned.
+        """
+        name = self.latest_name()
+        if name is None:
+            return None
+        meta = self.read_meta(name)
+        if not self.is_compatible(meta, check_age=check_age):
+            return None
+        if source is not None and meta.get('source', 'synthetic') != source:
+            return None
+
+        columns = MarketColumns.load(self._path(name, 'market'), mmap_mode=self.mmap_mode)
+        return columns.frame(), meta['fingerprint']
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_inputs(area, bedrooms, bathrooms, location):
+    """
+    Quantize raw form inputs so equivalent requests share one cache entry
+    """
+    return (
+        int(round(float(area))),
+        int(bedrooms),
+        round(float(bathrooms) * 2) / 2,  # bathrooms come in half steps
+        str(location).strip(),
+    )
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache with TTL in front of predict_price.
+
+    Entries are keyed by model version plus normalized inputs. Seeing a new
+    model version clears the cache, so a retrain invalidates it automatically.
+    """
+
+    def __init__(self, max_entries=4096, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._model_version = None
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+
+    def _check_version(self, model_version):
+        if model_version != self._model_version:
+            if self._entries:
+                self.stats['invalidations'] += 1
+            self._entries.clear()
+            self._model_version = model_version
+
+    def get_or_predict(self, model_version, predict, area, bedrooms, bathrooms, location):
+        """
+        Return a cached price or call ``predict(area, bedrooms, bathrooms, location)``
+        with the normalized inputs. ``None`` results are not cached.
+        """
+        key = normalize_inputs(area, bedrooms, bathrooms, location)
+        now = time.monotonic()
+        with self._lock:
+            self._check_version(model_version)
+            entry = self._entries.get(key)
+            if entry is not None:
+                price, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return price
+                del self._entries[key]
+                self.stats['expirations'] += 1
+            self.stats['misses'] += 1
+
+        price = predict(*key)
+        if price is None:
+            return None
+
+        with self._lock:
+            # The model may have been swapped while we were predicting
+            if model_version == self._model_version:
+                self._entries[key] = (price, now + self.ttl)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.stats['evictions'] += 1
+        return price
+
+    def invalidate(self):
+        with self._lock:
+            if self._entries:
+                self.stats['invalidations'] += 1
+            self._entries.clear()
+
+    def hit_rate(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Shared by all sessions in the process, like the model registry
+_cache = PredictionCache()
+
+
+def get_prediction_cache():
+    return _cache
@@ -0,0 +1,314 @@
+"""
+Headless JSON HTTP prediction service.
+
+Usage:
+    python prediction_service.py --port 8000
+    python prediction_service.py --port 8000 --workers 4   # pre-fork pool, one model in memory
+
+    curl -X POST localhost:8000/predict \\
+        -d '{"area": 1500, "bedrooms": 3, "bathrooms": 2, "location": "Pune"}'
+
+Concurrent requests are micro-batched: everything that arrives within
+``--max-wait-ms`` (up to ``--max-batch`` properties) is scored with a single
+``model.predict`` call. GET /metrics serves the instrumentation metrics in
+the Prometheus text format (collected when PRICE_METRICS=1).
+
+With ``--workers N`` the model is loaded once and N forked workers share it
+read-only (see worker_pool.py); /health reports each worker's memory.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+from http import HTTPStatus
+
+import pandas as pd
+
+import instrumentation
+from model_registry import ModelRegistry, load_serving_model
+from model_store import DEFAULT_ARTIFACT_DIR, ModelStore
+from price_model import predict_prices
+from worker_pool import PreforkPool, bind_socket, memory_usage
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_FIELDS = ('area', 'bedrooms', 'bathrooms', 'location')
+MAX_BODY_BYTES = 1 << 20
+
+
+class BadRequest(Exception):
+    pass
+
+
+def parse_property(item):
+    """
+    Validate one JSON property and return it as a plain dict
+    """
+    if not isinstance(item, dict):
+        raise BadRequest("each property must be a JSON object")
+    missing = [f for f in REQUIRED_FIELDS if f not in item]
+    if missing:
+        raise BadRequest(f"missing fields: {', '.join(missing)}")
+    try:
+        prop = {
+            'area': float(item['area']),
+            'bedrooms': float(item['bedrooms']),
+            'bathrooms': float(item['bathrooms']),
+            'location': str(item['location']),
+        }
+    except (TypeError, ValueError):
+        raise BadRequest("area, bedrooms and bathrooms must be numbers")
+    # json.loads accepts NaN and Infinity, which the model cannot score
+    for field in ('area', 'bedrooms', 'bathrooms'):
+        if not math.isfinite(prop[field]) or prop[field] <= 0:
+            raise BadRequest(f"{field} must be a positive finite number")
+    return prop
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent prediction requests into single model calls
+    """
+
+    def __init__(self, model, label_encoder, max_batch=256, max_wait_ms=2.0):
+        self.model = model
+        self.label_encoder = label_encoder
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue = asyncio.Queue()
+        self._task = None
+        self.stats = {'batches': 0, 'properties': 0}
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def predict(self, properties):
+        """
+        Queue a list of properties and wait for their prices
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((properties, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            size = len(pending[0][0])
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            rows = [prop for properties, _ in pending for prop in properties]
+            try:
+                # Prediction releases the GIL inside the trees; keep the loop responsive
+                prices = await loop.run_in_executor(None, self._predict, rows)
+            except Exception as e:
+                if len(pending) == 1:
+                    if not pending[0][1].done():
+                        pending[0][1].set_exception(e)
+                    continue
+                # One bad request must not fail the others batched with it
+                for item in pending:
+                    await self._run_alone(loop, *item)
+                continue
+
+            self.stats['batches'] += 1
+            self.stats['properties'] += len(rows)
+            offset = 0
+            for properties, future in pending:
+                if not future.done():
+                    future.set_result(prices[offset:offset + len(properties)])
+                offset += len(properties)
+
+    async def _run_alone(self, loop, properties, future):
+        try:
+            prices = await loop.run_in_executor(None, self._predict, properties)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        self.stats['batches'] += 1
+        self.stats['properties'] += len(properties)
+        if not future.done():
+            future.set_result(prices)
+
+    def _predict(self, rows):
+        with instrumentation.request('api_batch'):
+            frame = pd.DataFrame(rows, columns=list(REQUIRED_FIELDS))
+            return predict_prices(self.model, self.label_encoder, frame).tolist()
+
+
+class PredictionServer:
+    """
+    Minimal HTTP/1.1 server with keep-alive on top of asyncio streams
+    """
+
+    def __init__(self, batcher, model_version):
+        self.batcher = batcher
+        self.model_version = model_version
+        self.started_at = time.time()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {'error': 'malformed request line'}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {'error': 'invalid content-length'}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': 'body too large'}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                status, payload = await self.route(method, path.split('?', 1)[0], body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body):
+        if path == '/health' and method == 'GET':
+            return HTTPStatus.OK, {
+                'status': 'ok',
+                'model_version': self.model_version,
+                'uptime_seconds': round(time.time() - self.started_at, 1),
+                'batches': self.batcher.stats['batches'],
+                'properties': self.batcher.stats['properties'],
+                'pid': os.getpid(),
+                'memory_bytes': memory_usage(),
+            }
+        if path == '/metrics' and method == 'GET':
+            return HTTPStatus.OK, instrumentation.get_metrics().prometheus_text()
+        if path != '/predict':
+            return HTTPStatus.NOT_FOUND, {'error': 'not found'}
+        if method != 'POST':
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'use POST'}
+
+        try:
+            try:
+                payload = json.loads(body or b'null')
+            except ValueError:
+                raise BadRequest("body must be JSON")
+            if isinstance(payload, dict) and 'properties' in payload:
+                if not isinstance(payload['properties'], list) or not payload['properties']:
+                    raise BadRequest("'properties' must be a non-empty list")
+                properties = [parse_property(p) for p in payload['properties']]
+                prices = await self.batcher.predict(properties)
+                return HTTPStatus.OK, {'prices': prices, 'model_version': self.model_version}
+            prices = await self.batcher.predict([parse_property(payload)])
+            return HTTPStatus.OK, {'price': prices[0], 'model_version': self.model_version}
+        except BadRequest as e:
+            return HTTPStatus.BAD_REQUEST, {'error': str(e)}
+        except Exception as e:
+            logger.exception("Prediction failed")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)}
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        if isinstance(payload, str):
+            # Prometheus scrape
+            body, content_type = payload.encode(), 'text/plain; version=0.0.4'
+        else:
+            body, content_type = json.dumps(payload).encode(), 'application/json'
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+
+async def serve(host, port, model, label_encoder, model_version, max_batch=256, max_wait_ms=2.0, sock=None):
+    batcher = MicroBatcher(model, label_encoder, max_batch=max_batch, max_wait_ms=max_wait_ms)
+    batcher.start()
+    app = PredictionServer(batcher, model_version)
+    if sock is not None:
+        # Pre-fork worker: accept on the socket bound by the parent
+        server = await asyncio.start_server(app.handle_connection, sock=sock)
+    else:
+        server = await asyncio.start_server(app.handle_connection, host, port)
+    logger.info("Serving predictions on http://%s:%d (pid %d)", host, port, os.getpid())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="JSON HTTP price prediction service")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch', type=int, default=256, help="most properties scored per model call")
+    parser.add_argument('--max-wait-ms', type=float, default=2.0, help="how long to wait to fill a batch")
+    parser.add_argument('--artifact-dir', default=DEFAULT_ARTIFACT_DIR, help="model artifact directory")
+    parser.add_argument('--workers', type=int, default=1, help="forked worker processes sharing one model")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    registry = ModelRegistry(store=ModelStore(args.artifact_dir) if args.artifact_dir else None)
+    key, model, label_encoder = load_serving_model(registry)
+    model_version = key[0]
+
+    if args.workers > 1:
+        sock = bind_socket(args.host, args.port)
+        PreforkPool(lambda: asyncio.run(serve(args.host, args.port, model, label_encoder, model_version,
+                                              max_batch=args.max_batch, max_wait_ms=args.max_wait_ms,
+                                              sock=sock)),
+                    args.workers).run()
+        return
+
+    try:
+        asyncio.run(serve(args.host, args.port, model, label_encoder, model_version,
+                          max_batch=args.max_batch, max_wait_ms=args.max_wait_ms))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
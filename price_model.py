@@ -0,0 +1,214 @@
+import os
+import weakref
+
+import numpy as np
+import pandas as pd
+from backends import DEFAULT_BACKEND, make_estimator
+from instrumentation import count, counted, timed
+
+# Backend and hyperparameters for the shared price model
+MODEL_PARAMS = {
+    'backend': os.environ.get('PRICE_MODEL_BACKEND', DEFAULT_BACKEND),
+    'n_estimators': 100,
+    'random_state': 42,
+}
+
+FEATURE_COLUMNS = ['area', 'bedrooms', 'bathrooms', 'location_encoded']
+
+# Minimum realistic price returned by the estimator (INR)
+MIN_PRICE = 50000
+
+# Quantiles of the per-tree predictions reported as the price range
+INTERVAL_QUANTILES = (0.1, 0.9)
+
+# Relative band used when a backend has no per-tree predictions
+FALLBACK_INTERVAL = 0.1
+
+# Flattened leaf values per fitted forest, built on first use
+_leaf_tables = weakref.WeakKeyDictionary()
+
+
+def build_features(data, label_encoder):
+    """
+    Feature frame for the model built from column arrays, without copying the
+    whole market DataFrame (location strings are never duplicated)
+    """
+    return pd.DataFrame({
+        'area': data['area'].to_numpy(),
+        'bedrooms': data['bedrooms'].to_numpy(),
+        'bathrooms': data['bathrooms'].to_numpy(),
+        'location_encoded': encode_locations(label_encoder, data['location']),
+    }, columns=FEATURE_COLUMNS)
+
+
+def _feature_row(area, bedrooms, bathrooms, location_encoded):
+    """
+    One-row feature frame with the column names the model was fitted on
+    """
+    return pd.DataFrame([[area, bedrooms, bathrooms, location_encoded]], columns=FEATURE_COLUMNS)
+
+
+@timed('train_price_model')
+@counted('models_trained')
+def train_price_model(data, backend=DEFAULT_BACKEND, n_estimators=100, random_state=42, n_jobs=-1):
+    """
+    Train a machine learning model for price prediction
+    """
+    from sklearn.preprocessing import LabelEncoder
+
+    # Prepare features
+    le = LabelEncoder()
+    locations = data['location']
+    if isinstance(locations.dtype, pd.CategoricalDtype):
+        # Fit on the cities present instead of materializing one string per row
+        locations = locations.cat.remove_unused_categories().cat.categories
+    le.fit(locations)
+
+    # Features and target
+    X = build_features(data, le)
+    y = data['price'].to_numpy()
+
+    # Train the selected backend (Random Forest by default, trees built on all cores)
+    model = make_estimator(backend, n_estimators=n_estimators, random_state=random_state, n_jobs=n_jobs)
+    model.fit(X, y)
+
+    # Single-row predictions are faster without the thread pool; batch
+    # callers opt back in with model.set_params(n_jobs=...)
+    if 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=None)
+
+    return model, le
+
+
+def encode_locations(label_encoder, locations):
+    """
+    Vectorized location encoding; unknown cities fall back to code 0 like predict_price
+    """
+    codes = pd.Categorical(locations, categories=label_encoder.classes_).codes
+    return np.where(codes < 0, 0, codes)
+
+
+@timed('predict_price')
+@counted('price_estimates')
+def predict_price(model, label_encoder, area, bedrooms, bathrooms, location):
+    """
+    Predict house price based on input features
+    """
+    # Encode location
+    if location in label_encoder.classes_:
+        location_encoded = label_encoder.transform([location])[0]
+    else:
+        # Use most common location if not found
+        location_encoded = 0
+
+    # Create feature row
+    features = _feature_row(area, bedrooms, bathrooms, location_encoded)
+
+    # Make prediction
+    prediction = model.predict(features)[0]
+
+    return max(MIN_PRICE, int(prediction))  # Minimum realistic price
+
+
+def _leaf_table(model):
+    """
+    Leaf values of every tree in one flat array plus each tree's offset into it
+    """
+    table = _leaf_tables.get(model)
+    if table is None or len(table[1]) != len(model.estimators_):
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        values = np.concatenate([tree.value[:, 0, 0] for tree in trees])
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees[:-1]])
+        table = (values, offsets)
+        _leaf_tables[model] = table
+    return table
+
+
+def tree_predictions(model, features):
+    """
+    Per-tree predictions as an ``(n_rows, n_trees)`` array, or None if the
+    model is not a fitted forest.
+
+    One ``apply`` call finds every row's leaf in every tree and a single
+    gather reads the leaf values, instead of calling predict once per tree.
+    """
+    if not hasattr(model, 'estimators_') or not hasattr(model, 'apply'):
+        return None
+    values, offsets = _leaf_table(model)
+    return values[model.apply(features) + offsets]
+
+
+def _price_ranges(model, features, quantiles):
+    """
+    ``(prices, lower, upper)`` int64 arrays for a feature matrix
+    """
+    per_tree = tree_predictions(model, features)
+    if per_tree is None:
+        predictions = model.predict(features)
+        lower = predictions * (1 - FALLBACK_INTERVAL)
+        upper = predictions * (1 + FALLBACK_INTERVAL)
+    else:
+        # Forest predictions are the mean over trees
+        predictions = per_tree.mean(axis=1)
+        lower, upper = np.quantile(per_tree, quantiles, axis=1)
+    prices = np.maximum(MIN_PRICE, predictions.astype(np.int64))
+    # Keep the estimate inside its own range
+    lower = np.minimum(np.maximum(MIN_PRICE, lower.astype(np.int64)), prices)
+    upper = np.maximum(upper.astype(np.int64), prices)
+    return prices, lower, upper
+
+
+@timed('predict_price_range')
+@counted('price_estimates')
+def predict_price_range(model, label_encoder, area, bedrooms, bathrooms, location, quantiles=INTERVAL_QUANTILES):
+    """
+    Predict a house price with an uncertainty range.
+
+    Returns ``(price, lower, upper)``. For forests the range is the
+    ``quantiles`` of the individual tree predictions; other backends get a
+    fixed band of FALLBACK_INTERVAL around the estimate.
+    """
+    location_encoded = encode_locations(label_encoder, [location])[0]
+    features = _feature_row(area, bedrooms, bathrooms, location_encoded)
+    prices, lower, upper = _price_ranges(model, features, quantiles)
+    return int(prices[0]), int(lower[0]), int(upper[0])
+
+
+@timed('predict_prices')
+@counted('batch_predictions')
+def predict_prices(model, label_encoder, properties, chunk_size=50000):
+    """
+    Predict prices for a DataFrame of properties in fixed-size chunks.
+
+    Returns an int64 array aligned with ``properties``; memory use is bounded
+    by ``chunk_size`` rows of features at a time.
+    """
+    n_rows = len(properties)
+    count('predicted_rows', n_rows)
+    prices = np.empty(n_rows, dtype=np.int64)
+    for start in range(0, n_rows, chunk_size):
+        chunk = properties.iloc[start:start + chunk_size]
+        predictions = model.predict(build_features(chunk, label_encoder))
+        prices[start:start + len(chunk)] = np.maximum(MIN_PRICE, predictions.astype(np.int64))
+    return prices
+
+
+@timed('predict_price_ranges')
+@counted('batch_predictions')
+def predict_price_ranges(model, label_encoder, properties, quantiles=INTERVAL_QUANTILES, chunk_size=50000):
+    """
+    Batch version of predict_price_range.
+
+    Returns ``(prices, lower, upper)`` int64 arrays aligned with ``properties``,
+    computed chunk by chunk like predict_prices.
+    """
+    n_rows = len(properties)
+    count('predicted_rows', n_rows)
+    prices, lower, upper = (np.empty(n_rows, dtype=np.int64) for _ in range(3))
+    for start in range(0, n_rows, chunk_size):
+        chunk = properties.iloc[start:start + chunk_size]
+        end = start + len(chunk)
+        prices[start:end], lower[start:end], upper[start:end] = _price_ranges(
+            model, build_features(chunk, label_encoder), quantiles
+        )
+    return prices, lower, upper
@@ -0,0 +1,246 @@
+"""
+Precomputed price surface over the app's whole input grid.
+
+The form only offers area 200-10000 in steps of 50, the BEDROOM_OPTIONS,
+the BATHROOM_OPTIONS and the LOCATIONS. The model is evaluated once per
+version over that grid (206,850 cells) in vectorized batches. Price, lower
+and upper bound are stored as one int64 tensor ``(3, city, bedrooms,
+bathrooms, area)`` of about 5 MB next to the model artifact and
+memory-mapped back. Estimates on the grid and what-if curves such as price
+against area become array lookups.
+
+Usage:
+    python price_surface.py build             # for the current serving model
+    python price_surface.py verify --samples 5000
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from market_data import BATHROOM_OPTIONS, BEDROOM_OPTIONS, LOCATIONS
+from price_model import predict_price_range, predict_price_ranges
+
+AREA_MIN = 200
+AREA_MAX = 10000
+AREA_STEP = 50
+
+SURFACE_FILE = 'price_surface.npy'
+AXES_FILE = 'price_surface.json'
+
+# Surfaces kept in memory, one per model version in use
+MAX_CACHED_SURFACES = 2
+
+
+def grid_axes():
+    return {
+        'location': list(LOCATIONS),
+        'bedrooms': [int(b) for b in BEDROOM_OPTIONS],
+        'bathrooms': [float(b) for b in BATHROOM_OPTIONS],
+        'area': list(range(AREA_MIN, AREA_MAX + 1, AREA_STEP)),
+    }
+
+
+def grid_frame(axes):
+    """
+    Every grid cell as a properties DataFrame, in tensor (C) order
+    """
+    location, bedrooms, bathrooms, area = np.meshgrid(
+        np.arange(len(axes['location'])), axes['bedrooms'], axes['bathrooms'], axes['area'], indexing='ij'
+    )
+    return pd.DataFrame({
+        'area': area.ravel(),
+        'bedrooms': bedrooms.ravel(),
+        'bathrooms': bathrooms.ravel(),
+        'location': pd.Categorical.from_codes(location.ravel().astype(np.int16), categories=axes['location']),
+    })
+
+
+class PriceSurface:
+    """
+    ``(price, lower, upper)`` for every grid cell, indexed by the form's values
+    """
+
+    def __init__(self, values, axes):
+        self.values = values
+        self.axes = axes
+        self._location = {name: i for i, name in enumerate(axes['location'])}
+        self._bedrooms = {b: i for i, b in enumerate(axes['bedrooms'])}
+        self._bathrooms = {b: i for i, b in enumerate(axes['bathrooms'])}
+        self._areas = np.array(axes['area'])
+
+    @classmethod
+    def build(cls, model, label_encoder, chunk_size=50000):
+        axes = grid_axes()
+        prices, lower, upper = predict_price_ranges(model, label_encoder, grid_frame(axes), chunk_size=chunk_size)
+        shape = (len(axes['location']), len(axes['bedrooms']), len(axes['bathrooms']), len(axes['area']))
+        # int64 like the live predictions: listing prices can exceed the int32 range
+        values = np.stack([prices, lower, upper]).astype(np.int64).reshape((3,) + shape)
+        return cls(values, axes)
+
+    def save(self, directory):
+        """
+        Write the tensor and its axes atomically into ``directory``
+        """
+        tmp = os.path.join(directory, f'.{SURFACE_FILE}.{os.getpid()}.{threading.get_ident()}')
+        np.save(tmp, self.values)
+        os.replace(tmp + '.npy', os.path.join(directory, SURFACE_FILE))
+        with open(tmp, 'w') as f:
+            json.dump(self.axes, f)
+        os.replace(tmp, os.path.join(directory, AXES_FILE))
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """
+        Memory-map a saved surface, or None if missing, built for another grid
+        or in the old int32 layout
+        """
+        try:
+            with open(os.path.join(directory, AXES_FILE)) as f:
+                axes = json.load(f)
+            values = np.load(os.path.join(directory, SURFACE_FILE), mmap_mode=mmap_mode)
+        except (OSError, ValueError):
+            return None
+        # Surfaces saved as int32 may hold wrapped prices; rebuild those
+        if axes != grid_axes() or values.dtype != np.int64:
+            return None
+        return cls(values, axes)
+
+    def _area_index(self, area):
+        offset = area - AREA_MIN
+        if offset < 0 or offset % AREA_STEP or area > AREA_MAX:
+            return None
+        return int(offset // AREA_STEP)
+
+    def lookup(self, location, area, bedrooms, bathrooms):
+        """
+        ``(price, lower, upper)`` for a grid cell, or None for inputs off the grid
+        """
+        try:
+            cell = (self._location[location], self._bedrooms[bedrooms], self._bathrooms[float(bathrooms)])
+        except (KeyError, TypeError, ValueError):
+            return None
+        area_index = self._area_index(area)
+        if area_index is None:
+            return None
+        price, lower, upper = self.values[(slice(None),) + cell + (area_index,)]
+        return int(price), int(lower), int(upper)
+
+    def area_curve(self, location, bedrooms, bathrooms):
+        """
+        ``(areas, prices, lower, upper)`` across the whole area range, or None
+        """
+        try:
+            cell = (self._location[location], self._bedrooms[bedrooms], self._bathrooms[float(bathrooms)])
+        except (KeyError, TypeError, ValueError):
+            return None
+        prices, lower, upper = self.values[(slice(None),) + cell]
+        return self._areas, prices, lower, upper
+
+
+_surfaces = {}
+_surfaces_lock = threading.Lock()
+
+
+def _remember(key, surface):
+    with _surfaces_lock:
+        _surfaces[key] = surface
+        while len(_surfaces) > MAX_CACHED_SURFACES:
+            _surfaces.pop(next(iter(_surfaces)))
+
+
+def get_price_surface(key, store=None):
+    """
+    Surface for a model version from memory or the artifact store, or None.
+    Never builds one (see ensure_price_surface).
+    """
+    with _surfaces_lock:
+        surface = _surfaces.get(key)
+    if surface is None and store is not None:
+        surface = PriceSurface.load(store.artifact_path(key))
+        if surface is not None:
+            _remember(key, surface)
+    return surface
+
+
+def ensure_price_surface(key, model, label_encoder, store=None, rebuild=False):
+    """
+    Return the surface for a model version, building (and storing) it if
+    needed or if ``rebuild`` (the model under ``key`` was refitted)
+    """
+    surface = None if rebuild else get_price_surface(key, store)
+    if surface is None:
+        surface = PriceSurface.build(model, label_encoder)
+        if store is not None:
+            try:
+                surface.save(store.artifact_path(key))
+            except OSError:
+                # The in-memory surface still serves this process
+                pass
+        _remember(key, surface)
+    return surface
+
+
+def verify(surface, model, label_encoder, samples=2000, seed=0):
+    """
+    Compare ``samples`` random grid cells with live predict_price_range.
+
+    Returns ``(checked, mismatches)`` where mismatches lists the differing cells.
+    """
+    rng = np.random.default_rng(seed)
+    axes = surface.axes
+    mismatches = []
+    for _ in range(samples):
+        location = axes['location'][rng.integers(len(axes['location']))]
+        bedrooms = axes['bedrooms'][rng.integers(len(axes['bedrooms']))]
+        bathrooms = axes['bathrooms'][rng.integers(len(axes['bathrooms']))]
+        area = axes['area'][rng.integers(len(axes['area']))]
+        stored = surface.lookup(location, area, bedrooms, bathrooms)
+        live = predict_price_range(model, label_encoder, area, bedrooms, bathrooms, location)
+        if stored != live:
+            mismatches.append({'location': location, 'area': area, 'bedrooms': bedrooms,
+                               'bathrooms': bathrooms, 'stored': stored, 'live': live})
+    return samples, mismatches
+
+
+def main(argv=None):
+    from model_registry import ModelRegistry, load_serving_model
+    from model_store import DEFAULT_ARTIFACT_DIR, ModelStore
+
+    parser = argparse.ArgumentParser(description="Build or verify the precomputed price surface")
+    parser.add_argument('command', choices=['build', 'verify'])
+    parser.add_argument('--artifact-dir', default=DEFAULT_ARTIFACT_DIR, help="model artifact directory")
+    parser.add_argument('--samples', type=int, default=2000, help="grid cells checked by verify")
+    args = parser.parse_args(argv)
+
+    store = ModelStore(args.artifact_dir) if args.artifact_dir else None
+    key, model, label_encoder = load_serving_model(ModelRegistry(store=store))
+
+    start = time.perf_counter()
+    if args.command == 'build':
+        surface = PriceSurface.build(model, label_encoder)
+        if store is not None:
+            surface.save(store.artifact_path(key))
+        print(f"Built {surface.values[0].size:,} cells ({surface.values.nbytes / 1024:,.0f} KB) "
+              f"in {time.perf_counter() - start:.2f}s for model {key[0]}")
+        return 0
+
+    surface = get_price_surface(key, store)
+    if surface is None:
+        print(f"No price surface stored for model {key[0]}; run 'python price_surface.py build'")
+        return 1
+    checked, mismatches = verify(surface, model, label_encoder, samples=args.samples)
+    for mismatch in mismatches[:10]:
+        print(f"MISMATCH {mismatch}")
+    print(f"{checked - len(mismatches):,}/{checked:,} cells match live predictions "
+          f"({time.perf_counter() - start:.2f}s)")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,123 @@
+import functools
+import zlib
+
+import numpy as np
+
+from market_data import DEFAULT_SEED
+
+# Cities with premium amenities and metro location benefits
+TIER_1_CITIES = ['Mumbai', 'Delhi', 'Bangalore', 'Chennai', 'Hyderabad', 'Pune', 'Kolkata']
+
+TIER_1_BENEFITS = [
+    "Well-connected public transport",
+    "Close to IT/business hubs",
+    "Good educational institutions nearby",
+    "Healthcare facilities available",
+    "Shopping and entertainment options"
+]
+
+OTHER_CITY_BENEFITS = [
+    "Growing infrastructure",
+    "Affordable pricing",
+    "Peaceful residential area",
+    "Good connectivity to main city",
+    "Future development potential"
+]
+
+# Mock virtual tour descriptions
+TOUR_DESCRIPTIONS = {
+    "Living Room": {
+        "description": "Spacious living area with modern flooring and large windows providing natural light. Perfect for family gatherings and entertainment.",
+        "features": ["Large windows", "Modern flooring", "Ceiling fan", "TV unit space", "Seating area"]
+    },
+    "Master Bedroom": {
+        "description": "Comfortable master bedroom with attached bathroom and wardrobe space. Designed for privacy and relaxation.",
+        "features": ["Queen/King bed space", "Attached bathroom", "Built-in wardrobe", "Window with view", "AC provision"]
+    },
+    "Kitchen": {
+        "description": "Well-planned kitchen with modern fittings and ample storage space. Designed for convenient cooking and food preparation.",
+        "features": ["Modular design", "Storage cabinets", "Platform space", "Exhaust provision", "Water connection"]
+    },
+    "Bathroom": {
+        "description": "Modern bathroom with quality fittings and proper ventilation. Clean and hygienic design.",
+        "features": ["Modern fixtures", "Hot water provision", "Ventilation", "Storage space", "Quality tiles"]
+    },
+    "Balcony": {
+        "description": "Private balcony space offering outdoor relaxation and fresh air. Perfect for morning coffee or evening relaxation.",
+        "features": ["Outdoor space", "Safety grills", "City/garden view", "Drying area", "Fresh air circulation"]
+    },
+    "Common Areas": {
+        "description": "Well-maintained common areas including lobby, corridors, and amenity spaces. Designed for community living.",
+        "features": ["Security desk", "Mailbox area", "Elevator access", "Common utilities", "Maintenance room"]
+    }
+}
+
+
+def property_rng(city, bedrooms, bathrooms, area, seed=DEFAULT_SEED):
+    """
+    Generator seeded from the property inputs, so equal inputs draw equal values
+    """
+    entropy = [seed, zlib.crc32(str(city).encode()), int(bedrooms), int(round(float(bathrooms) * 2)), int(round(float(area)))]
+    return np.random.default_rng(np.random.SeedSequence(entropy))
+
+
+@functools.lru_cache(maxsize=4096)
+def get_property_features(city, bedrooms, bathrooms, area, seed=DEFAULT_SEED):
+    """
+    Generate property features and amenities based on location and specifications.
+
+    Deterministic for a given set of inputs and seed, and memoized; the
+    returned dict is shared and must be treated as read-only.
+    """
+    # Base amenities
+    base_amenities = [
+        'Car Parking', 'Security', 'Water Supply', 'Power Backup',
+        'Elevator', 'Intercom', 'Waste Management'
+    ]
+
+    # Premium amenities based on city tier
+    if city in TIER_1_CITIES:
+        premium_amenities = [
+            'Swimming Pool', 'Gymnasium', 'Clubhouse', 'Children Play Area',
+            'Landscaped Gardens', 'Jogging Track', 'Multi-purpose Hall',
+            'Indoor Games', 'CCTV Surveillance', 'Visitor Parking',
+            'Maintenance Staff', 'Fire Safety', 'Rainwater Harvesting'
+        ]
+    else:
+        premium_amenities = [
+            'Community Hall', 'Garden Area', 'Children Play Zone',
+            'Basic Security', 'Maintenance Service', 'Visitor Area'
+        ]
+
+    # Luxury amenities for large properties
+    if area > 1500 and bedrooms >= 3:
+        luxury_amenities = [
+            'Concierge Service', 'Spa & Wellness', 'Business Center',
+            'Banquet Hall', 'Meditation Area', 'Yoga Deck',
+            'Library', 'Kids Pool', 'Badminton Court', 'Tennis Court'
+        ]
+        all_amenities = base_amenities + premium_amenities + luxury_amenities[:5]
+    else:
+        all_amenities = base_amenities + premium_amenities[:8]
+
+    # Property specifications, drawn from a generator seeded by the inputs
+    rng = property_rng(city, bedrooms, bathrooms, area, seed)
+    specifications = {
+        'Floor Plan': f'{bedrooms}BHK with {bathrooms} bathrooms',
+        'Carpet Area': f'{area} sq ft',
+        'Floor Type': 'Vitrified tiles' if area > 1000 else 'Ceramic tiles',
+        'Kitchen': 'Modular kitchen' if area > 800 else 'Semi-modular kitchen',
+        'Balconies': '2 balconies' if bedrooms >= 3 else '1 balcony',
+        'Facing': rng.choice(['North', 'South', 'East', 'West', 'North-East', 'South-West']),
+        'Age': f'{rng.integers(0, 8)} years' if rng.random() > 0.3 else 'Under Construction',
+        'Furnishing': rng.choice(['Unfurnished', 'Semi-Furnished', 'Fully Furnished'], p=[0.6, 0.3, 0.1])
+    }
+
+    return {
+        'amenities': all_amenities,
+        'specifications': specifications
+    }
+
+
+def location_benefits(city):
+    return TIER_1_BENEFITS if city in TIER_1_CITIES else OTHER_CITY_BENEFITS
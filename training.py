@@ -0,0 +1,240 @@
+"""
+Training pipeline with per-run reports and incremental refresh.
+
+Usage:
+    python training.py --rows 200000 --refresh-rows 20000 --extra-trees 25
+    python training.py --listings fixtures/listings
+
+Full fits build trees on all cores. When new market rows arrive,
+refresh_model() grows additional trees (scikit-learn warm_start) on the
+combined old and new data instead of refitting the whole forest.
+``--refresh-city`` makes every new row one city's and checks that the other
+cities' estimates stay within MAX_REFRESH_DRIFT.
+"""
+import argparse
+import copy
+import json
+import logging
+import os
+import pickle
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import pandas as pd
+
+from backends import make_estimator
+from price_model import MODEL_PARAMS, build_features, predict_prices, train_price_model
+
+logger = logging.getLogger(__name__)
+
+# Largest relative change in other cities' estimates a one-city refresh may cause
+MAX_REFRESH_DRIFT = 0.1
+
+
+def model_size_bytes(model):
+    """
+    Serialized size of a fitted model
+    """
+    return len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def max_rss_bytes():
+    """
+    Process resident-set high-water mark, or None where unsupported
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def rss_bytes():
+    """
+    Current resident set size of this process, or None where unsupported
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class _RSSSampler(threading.Thread):
+    """
+    Polls the resident set size until stopped and keeps the highest value
+    """
+
+    def __init__(self, interval=0.005):
+        super().__init__(name='rss-sampler', daemon=True)
+        self.interval = interval
+        self.peak = rss_bytes() or 0
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            self.peak = max(self.peak, rss_bytes() or 0)
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        self.peak = max(self.peak, rss_bytes() or 0)
+
+
+def _measure(fit):
+    """
+    Run ``fit()`` and return its result with wall time and the peak memory
+    the run added: the highest resident set size seen while it ran (native
+    tree allocations included) minus the size before it. None where RSS
+    cannot be read.
+    """
+    before = rss_bytes()
+    max_rss_before = max_rss_bytes()
+    sampler = _RSSSampler() if before is not None else None
+    if sampler is not None:
+        sampler.start()
+    start = time.perf_counter()
+    try:
+        result = fit()
+    finally:
+        elapsed = time.perf_counter() - start
+        if sampler is not None:
+            sampler.stop()
+    if sampler is None:
+        return result, elapsed, None
+    peak = sampler.peak
+    # A spike between samples still shows up if it raised the process high-water mark
+    max_rss_after = max_rss_bytes()
+    if max_rss_after is not None and max_rss_before is not None and max_rss_after > max_rss_before:
+        peak = max(peak, max_rss_after)
+    return result, elapsed, max(peak - before, 0)
+
+
+def _report(kind, model, n_rows, elapsed, peak):
+    report = {
+        'kind': kind,
+        'rows': int(n_rows),
+        'trees': len(getattr(model, 'estimators_', ())),
+        'fit_seconds': round(elapsed, 4),
+        # Resident memory added by this run at its peak
+        'peak_memory_bytes': None if peak is None else int(peak),
+        # High-water mark of the whole process so far
+        'max_rss_bytes': max_rss_bytes(),
+        'model_size_bytes': model_size_bytes(model),
+    }
+    logger.info("Training run: %s", report)
+    return report
+
+
+def train_with_report(data, n_jobs=-1, **params):
+    """
+    Full fit on all cores; returns ``(model, label_encoder, report)``
+    """
+    params = {**MODEL_PARAMS, **params}
+    # Import the backend's dependencies before the measured window
+    make_estimator(params['backend'])
+    import sklearn.preprocessing  # noqa: F401
+
+    (model, label_encoder), elapsed, peak = _measure(
+        lambda: train_price_model(data, n_jobs=n_jobs, **params)
+    )
+    return model, label_encoder, _report('full', model, len(data), elapsed, peak)
+
+
+def refresh_model(model, label_encoder, data, extra_trees=25, n_jobs=-1):
+    """
+    Grow ``extra_trees`` trees on top of an existing forest.
+
+    ``data`` is the whole dataset including the newly arrived rows: every
+    tree is averaged into every estimate, so trees fitted on the new rows
+    alone would pull all cities towards whatever those rows cover.
+
+    The input model is left untouched (it may be serving other sessions): a
+    shallow copy shares the existing fitted trees and only the new ones are
+    built. Rows for cities the label encoder has never seen cannot be encoded
+    consistently, so they require a full retrain. Returns ``(model, report)``.
+    """
+    if not hasattr(model, 'estimators_'):
+        raise ValueError(f"{type(model).__name__} cannot grow trees incrementally; retrain it instead")
+    unknown = set(data['location'].unique()) - set(label_encoder.classes_)
+    if unknown:
+        raise ValueError(f"New cities need a full retrain: {', '.join(sorted(map(str, unknown)))}")
+
+    refreshed = copy.copy(model)
+    refreshed.estimators_ = list(model.estimators_)
+    refreshed.set_params(
+        warm_start=True,
+        n_estimators=len(model.estimators_) + extra_trees,
+        n_jobs=n_jobs,
+    )
+
+    X = build_features(data, label_encoder)
+    y = data['price'].to_numpy()
+    _, elapsed, peak = _measure(lambda: refreshed.fit(X, y))
+    refreshed.set_params(warm_start=False, n_jobs=None)
+    return refreshed, _report('refresh', refreshed, len(data), elapsed, peak)
+
+
+def estimate_drift(before, after, label_encoder, locations):
+    """
+    Largest relative change between two models' estimates over a small grid
+    of homes in ``locations``
+    """
+    probe = pd.DataFrame(
+        [(area, bedrooms, bathrooms, location) for location in locations
+         for area, bedrooms, bathrooms in ((800, 2, 1), (1200, 3, 2), (2500, 4, 3))],
+        columns=['area', 'bedrooms', 'bathrooms', 'location'],
+    )
+    old = predict_prices(before, label_encoder, probe)
+    new = predict_prices(after, label_encoder, probe)
+    return float((abs(new - old) / old).max())
+
+
+def main(argv=None):
+    from market_data import generate_market_data
+
+    parser = argparse.ArgumentParser(description="Train the price model and report cost per run")
+    parser.add_argument('--rows', type=int, default=500, help="rows in the initial training set")
+    parser.add_argument('--listings', help="train on local listing files (see ingest.py) instead of generated data")
+    parser.add_argument('--refresh-rows', type=int, default=0, help="new rows used for an incremental refresh")
+    parser.add_argument('--extra-trees', type=int, default=25, help="trees grown per refresh")
+    parser.add_argument('--refresh-city', help="make every refresh row this city's and check the others' drift")
+    parser.add_argument('--jobs', type=int, default=-1, help="cores used for fitting (-1 for all)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.listings:
+        from ingest import load_listings
+        data, ingest_report = load_listings(args.listings)
+        print(json.dumps(ingest_report.as_dict()))
+    else:
+        data = generate_market_data(args.rows, seed=args.seed)
+    model, label_encoder, report = train_with_report(data, n_jobs=args.jobs)
+    print(json.dumps(report))
+
+    if args.refresh_rows:
+        new_rows = generate_market_data(args.refresh_rows, seed=args.seed + 1)
+        if args.refresh_city:
+            new_rows['location'] = args.refresh_city
+        combined = pd.concat([data, new_rows[data.columns]], ignore_index=True)
+        refreshed, report = refresh_model(model, label_encoder, combined,
+                                          extra_trees=args.extra_trees, n_jobs=args.jobs)
+        others = [c for c in label_encoder.classes_ if c not in set(new_rows['location'].astype(str))]
+        if others:
+            report['other_city_drift'] = round(estimate_drift(model, refreshed, label_encoder, others), 4)
+        print(json.dumps(report))
+        if args.refresh_city and report.get('other_city_drift', 0) > MAX_REFRESH_DRIFT:
+            print(f"Refreshing with {args.refresh_city} rows moved other cities' estimates by "
+                  f"{report['other_city_drift']:.1%} (limit {MAX_REFRESH_DRIFT:.0%})")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
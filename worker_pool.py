@@ -0,0 +1,128 @@
+"""
+Pre-fork worker pool for the prediction service.
+
+The parent process loads the model and market data once, binds the listening
+socket and forks the workers, which inherit all of it. Nothing writes to the
+tree node arrays after loading, so their pages stay shared copy-on-write
+between every worker; the market columns are memory-mapped read-only from
+the artifact store and shared through the page cache. ``gc.freeze()`` before
+forking keeps the garbage collector from touching (and so copying) the
+objects loaded by the parent.
+
+POSIX only (uses ``os.fork``).
+"""
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+
+logger = logging.getLogger(__name__)
+
+# A worker that dies sooner than this after starting is not restarted again
+# immediately, so a crash loop cannot spin the parent
+MIN_WORKER_LIFETIME = 1.0
+
+
+def bind_socket(host, port, backlog=1024):
+    """
+    Listening TCP socket to share between forked workers
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.setblocking(False)
+    return sock
+
+
+def memory_usage(pid='self'):
+    """
+    Memory of a process in bytes from /proc/<pid>/smaps_rollup: ``rss``,
+    ``pss`` (shared pages split between their users), ``shared`` and
+    ``private`` (what the process alone would free). None where unavailable.
+    """
+    fields = {'Rss': 'rss', 'Pss': 'pss', 'Shared_Clean': 'shared', 'Shared_Dirty': 'shared',
+              'Private_Clean': 'private', 'Private_Dirty': 'private'}
+    usage = {'rss': 0, 'pss': 0, 'shared': 0, 'private': 0}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                name, _, value = line.partition(':')
+                if name in fields:
+                    usage[fields[name]] += int(value.split()[0]) * 1024
+    except (OSError, ValueError):
+        return None
+    return usage
+
+
+class PreforkPool:
+    """
+    Fork ``workers`` children that each call ``target()``, restart any that
+    exit, and stop them all on SIGTERM or SIGINT
+    """
+
+    def __init__(self, target, workers):
+        if not hasattr(os, 'fork'):
+            raise RuntimeError("The pre-fork worker pool needs os.fork (Linux or macOS)")
+        self.target = target
+        self.workers = workers
+        self.children = {}
+        self._stopping = False
+
+    def _spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            # Child: default signal handling, then serve until told to stop
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            status = 0
+            try:
+                self.target()
+            except KeyboardInterrupt:
+                pass
+            except Exception:
+                logger.exception("Worker %d failed", os.getpid())
+                status = 1
+            finally:
+                os._exit(status)
+        self.children[pid] = time.monotonic()
+        logger.info("Started worker %d", pid)
+
+    def _stop(self, signum, frame):
+        self._stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        """
+        Fork the workers and supervise them until the pool is stopped
+        """
+        # Everything loaded so far is shared with the workers; keep the
+        # collector from writing to those objects in the children
+        gc.collect()
+        gc.freeze()
+
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        for _ in range(self.workers):
+            self._spawn()
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            started = self.children.pop(pid, None)
+            if started is None or self._stopping:
+                continue
+            logger.warning("Worker %d exited with status %d, restarting", pid, os.waitstatus_to_exitcode(status))
+            if time.monotonic() - started < MIN_WORKER_LIFETIME:
+                time.sleep(MIN_WORKER_LIFETIME)
+            self._spawn()